@@ -0,0 +1,121 @@
+"""消息事件分配基准。
+
+对比快速工厂 (FAST_FACTORIES) 与紧凑事件 (COMPACT_EVENTS) 构建单个消息事件的
+耗时、分配的内存块数与字节数，以及分发时读取字段 (gather) 与 ``target`` 的耗时。
+
+紧凑事件只引用原始负载中按需解析字段的子对象而不复制，统计中不包含这部分 (它本就由 JSON 解码分配)。
+
+用法::
+
+    uv run python benchmarks/event_alloc.py [-n 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Coroutine, Dict, Tuple
+
+from webhook_decode import SAMPLES
+
+from litetower.events.compact import COMPACT_EVENTS
+from litetower.events.common import gather_event
+from litetower.network.decoder import FAST_FACTORIES
+
+
+def measure(func: Callable[[], Any], number: int) -> float:
+    """返回单次调用的平均耗时 (µs)"""
+    for _ in range(min(number, 1000)):
+        func()
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> None:
+    """同步执行不会挂起的协程"""
+    try:
+        coro.send(None)
+    except StopIteration:
+        return
+    raise RuntimeError("coroutine suspended")
+
+
+def allocation(build: Callable[[], Any], number: int) -> Tuple[float, float]:
+    """返回每个存活事件平均占用的 (内存块数, 字节数)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    events = [build() for _ in range(number)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    del events
+    return blocks / number, size / number
+
+
+def check_compatible(event_type: str, fast: Any, compact: Any) -> None:
+    """两种表示的字段与 target 必须一致"""
+    for f in dataclasses.fields(fast):
+        expected, actual = getattr(fast, f.name), getattr(compact, f.name)
+        assert actual == expected, f"字段不一致: {event_type}.{f.name}"
+    assert compact.target == fast.target, f"target 不一致: {event_type}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    builders: Dict[str, Dict[str, Callable[[Dict[str, Any], str], Any]]] = {
+        "fast": FAST_FACTORIES,
+        "compact": COMPACT_EVENTS,
+    }
+
+    header = (
+        f"{'event':<26}{'impl':<10}{'build':>12}{'gather':>12}{'target':>12}"
+        f"{'blocks':>10}{'bytes':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for event_type, sample in SAMPLES.items():
+        d, payload_id = sample["d"], sample["id"]
+        check_compatible(
+            event_type,
+            FAST_FACTORIES[event_type](d, payload_id),
+            COMPACT_EVENTS[event_type](d, payload_id),
+        )
+        for name, factories in builders.items():
+            factory = factories[event_type]
+
+            def build() -> Any:
+                return factory(d, payload_id)
+
+            def gather() -> Any:
+                ctx: Dict[str, Any] = {}
+                run(gather_event(factory(d, payload_id), ctx))  # type: ignore[arg-type]
+                return ctx
+
+            def target() -> Any:
+                event = factory(d, payload_id)
+                event.target
+                return event.target
+
+            blocks, size = allocation(build, min(args.number, 5000))
+            print(
+                f"{event_type:<26}{name:<10}"
+                f"{measure(build, args.number):>9.2f} µs"
+                f"{measure(gather, args.number):>9.2f} µs"
+                f"{measure(target, args.number):>9.2f} µs"
+                f"{blocks:>10.1f}{size:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
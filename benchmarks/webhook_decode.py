@@ -0,0 +1,151 @@
+"""Webhook 负载解码基准。
+
+对比旧路径 (json.loads -> Payload.model_validate -> _make_*_message)
+与快速路径 (JSON 后端 -> FAST_FACTORIES) 构建单个消息事件的耗时。
+
+用法::
+
+    uv run python benchmarks/webhook_decode.py [-n 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+from litetower.models.webhook import Payload
+from litetower.network.decoder import FAST_FACTORIES, JSON_BACKENDS
+from litetower.network.webhook import EVENT_MAP
+
+_AUTHOR = {"id": "A1B2C3", "member_openid": "A1B2C3", "union_openid": "U1B2C3"}
+_ATTACHMENTS = [
+    {
+        "content_type": "image/png",
+        "filename": "B8E3.png",
+        "height": 720,
+        "width": 1280,
+        "size": 183_512,
+        "url": "multimedia.nt.qq.com.cn/download?appid=1407&fileid=abc",
+    }
+]
+
+SAMPLES: Dict[str, Dict[str, Any]] = {
+    "GROUP_AT_MESSAGE_CREATE": {
+        "op": 0,
+        "id": "GROUP_AT_MESSAGE_CREATE:abcdef",
+        "t": "GROUP_AT_MESSAGE_CREATE",
+        "d": {
+            "id": "ROBOT1.0_abcdef",
+            "content": " /echo hello world",
+            "timestamp": "2024-11-14T20:43:26+08:00",
+            "group_id": "G1",
+            "group_openid": "G1OPENID",
+            "author": _AUTHOR,
+            "attachments": _ATTACHMENTS,
+            "message_scene": {"source": "default"},
+        },
+    },
+    "C2C_MESSAGE_CREATE": {
+        "op": 0,
+        "id": "C2C_MESSAGE_CREATE:abcdef",
+        "t": "C2C_MESSAGE_CREATE",
+        "d": {
+            "id": "ROBOT1.0_abcdef",
+            "content": "ping",
+            "timestamp": "2024-11-14T20:43:26+08:00",
+            "author": {"id": "U1", "user_openid": "U1", "union_openid": "U1"},
+            "message_scene": {"source": "default"},
+        },
+    },
+    "AT_MESSAGE_CREATE": {
+        "op": 0,
+        "id": "AT_MESSAGE_CREATE:abcdef",
+        "t": "AT_MESSAGE_CREATE",
+        "d": {
+            "id": "08a1b2c3",
+            "content": "<@!1234> hello <#5678>",
+            "timestamp": "2024-11-14T20:43:26+08:00",
+            "channel_id": "5678",
+            "guild_id": "9012",
+            "author": {"id": "1111", "username": "alice", "avatar": "http://a", "bot": False},
+            "member": {"nick": "alice", "roles": ["1"], "joined_at": "2024-01-01T00:00:00+08:00"},
+            "mentions": [{"id": "1234", "username": "bot", "avatar": "http://b", "bot": True}],
+            "seq": 42,
+            "seq_in_channel": "42",
+        },
+    },
+    "DIRECT_MESSAGE_CREATE": {
+        "op": 0,
+        "id": "DIRECT_MESSAGE_CREATE:abcdef",
+        "t": "DIRECT_MESSAGE_CREATE",
+        "d": {
+            "id": "08a1b2c4",
+            "content": "hi",
+            "timestamp": "2024-11-14T20:43:26+08:00",
+            "channel_id": "5678",
+            "guild_id": "9013",
+            "src_guild_id": "9012",
+            "direct_message": True,
+            "author": {"id": "1111", "username": "alice", "avatar": "http://a", "bot": False},
+            "member": {"joined_at": "2024-01-01T00:00:00+08:00"},
+            "seq": 7,
+            "seq_in_channel": "7",
+        },
+    },
+}
+
+
+def legacy_decode(body: bytes) -> Any:
+    data = json.loads(body)
+    payload = Payload.model_validate(data)
+    _, factory = EVENT_MAP[payload.t]
+    return factory(payload.d, payload.id)
+
+
+def make_fast_decode(loads: Callable[[bytes], Any]) -> Callable[[bytes], Any]:
+    def fast_decode(body: bytes) -> Any:
+        data = loads(body)
+        return FAST_FACTORIES[data["t"]](data["d"], data["id"])
+
+    return fast_decode
+
+
+def measure(decode: Callable[[bytes], Any], body: bytes, number: int) -> float:
+    """返回单次解码的平均耗时 (µs)"""
+    for _ in range(min(number, 1000)):
+        decode(body)
+    start = time.perf_counter()
+    for _ in range(number):
+        decode(body)
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    decoders: Dict[str, Callable[[bytes], Any]] = {"legacy": legacy_decode}
+    for name, loader in JSON_BACKENDS.items():
+        try:
+            decoders[f"fast/{name}"] = make_fast_decode(loader())
+        except ImportError:
+            print(f"skip backend {name}: not installed")
+
+    header = f"{'event':<26}" + "".join(f"{name:>16}" for name in decoders)
+    print(header)
+    print("-" * len(header))
+    for event_type, sample in SAMPLES.items():
+        body = json.dumps(sample).encode()
+        expected = legacy_decode(body)
+        row = f"{event_type:<26}"
+        for name, decode in decoders.items():
+            assert decode(body) == expected, f"{name} 与旧路径结果不一致: {event_type}"
+            row += f"{measure(decode, body, args.number):>13.2f} µs"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -33,10 +33,9 @@ plugin_dir = Path(__file__).parent / "plugins"
 
 print(f"Loading plugins from {plugin_dir}...")
 
-for _, name, _ in pkgutil.iter_modules([str(plugin_dir)]):
-    full_name = f"{plugin_package}.{name}"
-    print(f"Loading {full_name}...")
-    beacon.require(full_name)
+beacon.require_all(
+    f"{plugin_package}.{name}" for _, name, _ in pkgutil.iter_modules([str(plugin_dir)])
+)
 
 if __name__ == "__main__":
     bot.launch_blocking()
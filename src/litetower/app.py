@@ -9,6 +9,8 @@ import asyncio
 import itertools
 import json
 import time
+from functools import partial
+from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Union
 
 import arclet.letoderea as leto
@@ -18,18 +20,32 @@ from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 from starlette.routing import Route
-from starlette.staticfiles import StaticFiles
 
+from litetower.config.api import ApiConfig
 from litetower.config.debug import DebugConfig
+from litetower.config.outbound import OutboundConfig
 from litetower.config.server import FileServerConfig, WebHookConfig
+from litetower.events.attachments import configure_prefetch
 from litetower.events.builtin import ApplicationReady
 from litetower.message.element import Element, MediaElement
 from litetower.models.api import MessageSent, OpenAPIError
+from litetower.models.elements import configure_downloader
 from litetower.models.target import Target
 from litetower.network.qqapi import QQAPI
-from litetower.network.webhook import postevent
+from litetower.network.decoder import configure_compact_events, get_json_backend
+from litetower.network.download import AttachmentDownloader
+from litetower.network.fileserver import MediaFileServer
+from litetower.network.dedup import Deduplicator, create_deduplicator
+from litetower.network.ingress import WebhookIngress
+from litetower.network.mediacache import MediaCache
+from litetower.network.outbound import OutboundDispatcher
+from litetower.network.ratelimit import RateLimiter
+from litetower.network.retry import RetryPolicy
+from litetower.network.upload import MediaStager
+from litetower.network.webhook import dispatch_payload, postevent
 from litetower.services.auth import QAuthService
 from litetower.services.httpx import HttpxService
+from litetower.services.ingress import IngressService
 from litetower.services.uvicorn import UvicornService
 from litetower.utils import get_msg_type
 from litetower.beacon import Beacon
@@ -56,6 +72,8 @@ class Litetower:
         webhook_config: Optional[WebHookConfig] = None,
         file_server_config: Optional[FileServerConfig] = None,
         debug_config: Optional[DebugConfig] = None,
+        outbound_config: Optional[OutboundConfig] = None,
+        api_config: Optional[ApiConfig] = None,
         sand_box: bool = False,
     ):
         self.appid = appid
@@ -66,8 +84,50 @@ class Litetower:
         self.webhook_config = webhook_config or WebHookConfig()
         self.file_server_config = file_server_config or FileServerConfig()
         self.debug_config = debug_config
+        self.api_config = api_config or ApiConfig()
 
         self._qqapi: Optional[QQAPI] = None
+        self.ingress: Optional[WebhookIngress] = (
+            WebhookIngress(self.webhook_config.ingress, dispatch_payload)
+            if self.webhook_config.ingress.enabled
+            else None
+        )
+        self.dedup: Optional[Deduplicator] = (
+            create_deduplicator(self.webhook_config.dedup)
+            if self.webhook_config.dedup.enabled
+            else None
+        )
+        self.outbound = OutboundDispatcher(outbound_config)
+        self.ratelimiter: Optional[RateLimiter] = (
+            RateLimiter(self.api_config.ratelimit)
+            if self.api_config.ratelimit.enabled
+            else None
+        )
+        self.media_cache: Optional[MediaCache] = (
+            MediaCache(self.api_config.media_cache)
+            if self.api_config.media_cache.enabled
+            else None
+        )
+        self.downloader = AttachmentDownloader(self.api_config.download)
+        configure_downloader(self.downloader)
+        configure_prefetch(self.api_config.download.prefetch)
+        configure_compact_events(self.webhook_config.compact_events)
+        self.file_server: Optional[MediaFileServer] = (
+            MediaFileServer(self.file_server_config)
+            if self.file_server_config.stage_media
+            or Path(self.file_server_config.localpath).exists()
+            else None
+        )
+        self.stager: Optional[MediaStager] = (
+            MediaStager(self.file_server_config)
+            if self.file_server_config.stage_media
+            else None
+        )
+        self.retry_policy: Optional[RetryPolicy] = (
+            RetryPolicy(self.api_config.retry)
+            if self.api_config.retry.enabled
+            else None
+        )
         self._msg_seq = itertools.count(1)
 
         # 保存单例引用
@@ -81,7 +141,8 @@ class Litetower:
 
         # Initialize Beacon
         self.beacon = Beacon.current()
-        self.beacon.install_behaviour(LetodereaBehaviour())
+        self.letoderea_behaviour = LetodereaBehaviour()
+        self.beacon.install_behaviour(self.letoderea_behaviour)
 
     @property
     def qqapi(self) -> QQAPI:
@@ -94,32 +155,31 @@ class Litetower:
         """构建 Starlette ASGI 应用"""
         debug_config = self.debug_config
         bot_secret = self.clientSecret
+        ingress = self.ingress
+        dedup = self.dedup
+        loads = get_json_backend(self.webhook_config.json_backend)
+        index = (
+            self.letoderea_behaviour.index
+            if self.webhook_config.skip_unsubscribed
+            else None
+        )
 
         async def webhook_handler(request: Request) -> Response:
             # 记录请求进入
             # log_event_flow("Webhook", request.client.host if request.client else "Unknown", "Received POST")
-            return await postevent(request, debug_config, bot_secret)
+            return await postevent(
+                request, debug_config, bot_secret, ingress, dedup, loads, index
+            )
 
         routes = [
             Route(self.webhook_config.postevent, webhook_handler, methods=["POST"]),
         ]
 
-        app = Starlette(routes=routes)
-
-        # 文件服务器
-        try:
-            import pathlib
-
-            localpath = pathlib.Path(self.file_server_config.localpath)
-            if localpath.exists():
-                app.mount(
-                    self.file_server_config.remote_url,
-                    StaticFiles(directory=str(localpath)),
-                    name="fileserver",
-                )
-        except Exception as e:
-            logger.warning(f"文件服务器挂载失败: {e}")
+        # 文件服务器 (配置独立端口时由单独的 Uvicorn 服务承载)
+        if self.file_server is not None and self.file_server_config.port is None:
+            routes.append(self.file_server.route)
 
+        app = Starlette(routes=routes)
         return app
 
     def launch_blocking(self) -> None:
@@ -137,6 +197,17 @@ class Litetower:
                 port=self.webhook_config.port,
             )
         )
+        if self.file_server is not None and self.file_server_config.port is not None:
+            self.mgr.add_component(
+                UvicornService(
+                    Starlette(routes=[self.file_server.route]),
+                    host=self.file_server_config.host or self.webhook_config.host,
+                    port=self.file_server_config.port,
+                    id="litetower.services/uvicorn-fileserver",
+                )
+            )
+        if self.ingress is not None:
+            self.mgr.add_component(IngressService(self.ingress))
         self.mgr.add_component(AppService(self))
 
         logger.info(f"Litetower 启动中 [appid={self.appid}]")
@@ -200,6 +271,31 @@ class Litetower:
         resp = await self.qqapi.send_dms_message(target.target_unit, msg_data)
         return self._parse_message_sent(resp, "dms", target.target_unit)
 
+    def enqueue_message(
+        self,
+        msg_type: Literal["group", "c2c", "channel", "dms"],
+        target: Target,
+        content: str = "",
+        element: Optional[Element] = None,
+        event_id: Optional[str] = None,
+    ) -> asyncio.Future[MessageSent]:
+        """将消息放入目标的有序发送队列，立即返回发送结果的 Future。
+
+        同一目标的消息按入队顺序依次发送，不同目标之间并发。
+        不等待返回值即为 fire-and-forget，发送失败时记录错误日志。
+        """
+        if msg_type == "group":
+            send = partial(self.send_group_message, target, content, element, event_id)
+        elif msg_type == "c2c":
+            send = partial(self.send_c2c_message, target, content, element, event_id)
+        elif msg_type == "channel":
+            send = partial(self.send_channel_message, target, content, element)
+        elif msg_type == "dms":
+            send = partial(self.send_dms_message, target, content, element)
+        else:
+            raise ValueError(f"未知的消息类型: {msg_type}")
+        return self.outbound.enqueue(msg_type, target.target_unit, send)
+
     async def recall_message(
         self,
         target_type: str,
@@ -268,6 +364,7 @@ class Litetower:
             timestamp=resp.get("timestamp", ""),
             target_type=target_type,
             target_id=target_id,
+            duplicate=resp.get("duplicate", False),
         )
 
     def _build_message_data(
@@ -355,7 +452,12 @@ class AppService(Service):
                 auth_service=auth_service,
                 http_client=httpx_service.async_client,
                 sand_box=self.app.sand_box,
+                ratelimiter=self.app.ratelimiter,
+                retry_policy=self.app.retry_policy,
+                media_cache=self.app.media_cache,
+                stager=self.app.stager,
             )
+            self.app.downloader.http_client = httpx_service.async_client
             logger.info("QQAPI 客户端初始化完成")
 
             leto.publish(ApplicationReady())
@@ -365,4 +467,7 @@ class AppService(Service):
             await manager.status.wait_for_sigexit()
 
         async with self.stage("cleanup"):
+            await self.app.outbound.close()
+            if self.app.media_cache is not None:
+                self.app.media_cache.save()
             logger.info("核心服务已停止")
@@ -3,12 +3,16 @@ from arclet.letoderea import Propagator, Provider, ProviderFactory
 
 from .channel import Channel
 from .cube import Cube
+from .loading import LoadProfile
 from .manager import Beacon
 from .schema import ListenerSchema
 
 def require(module: str):
     return Beacon.current().require(module)
 
+def require_all(modules, **kwargs):
+    return Beacon.current().require_all(modules, **kwargs)
+
 T = TypeVar("T")
 
 def propagator(*propagators: Propagator):
@@ -1,22 +1,54 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from collections import Counter
+from typing import Any, Dict, List
 
 import arclet.letoderea as leto
+from litetower.message.parser.base import MatcherChain, fuse_matchers
 from ..behaviour import Behaviour
 from ..cube import Cube
 from ..schema import ListenerSchema
 
 
+class SubscriberIndex:
+    """事件类型 -> 已加载订阅者数量的索引。
+
+    由 ``LetodereaBehaviour.allocate`` / ``release`` 维护，
+    仅统计经 Beacon 加载的监听器。
+    """
+
+    def __init__(self):
+        self._counts: Counter[type] = Counter()
+
+    def add(self, event_type: type) -> None:
+        self._counts[event_type] += 1
+
+    def remove(self, event_type: type) -> None:
+        self._counts[event_type] -= 1
+        if self._counts[event_type] <= 0:
+            del self._counts[event_type]
+
+    def __contains__(self, event_type: type) -> bool:
+        """该事件类型 (或其父类) 是否存在订阅者"""
+        counts = self._counts
+        return any(cls in counts for cls in event_type.__mro__)
+
+
 class LetodereaBehaviour(Behaviour):
     def __init__(self):
-        self._subscribers: Dict[int, Any] = {}
+        self._subscribers: Dict[int, List[Any]] = {}
+        self.index = SubscriberIndex()
+        self._routed: Dict[int, List[Any]] = {}
+        """id(匹配器) -> [匹配器, 使用它的监听器数量]；第一个监听器分配时注册其路由，最后一个释放时注销"""
 
     def allocate(self, cube: Cube) -> Any:
         if isinstance(cube.schema, ListenerSchema):
             listener = cube.content
             schema = cube.schema
-            
+            subscribers: List[Any] = []
+            # 相邻的内容匹配器合并为一个前置步骤，每次分发只调用一次
+            propagators = fuse_matchers(schema.propagators)
+
             # Register to Letoderea
             for event_type in schema.events:
                 # Letoderea.on returns a decorator, which we call with listener
@@ -24,26 +56,58 @@ class LetodereaBehaviour(Behaviour):
                     event_type,
                     providers=schema.providers,
                 )
-                
+
                 subscriber = decorator(listener)
-                
+                lookup = getattr(subscriber, "_propagator_cache", None)
+
                 # Use propagate() to add propagators so their providers() are registered
-                for prog in schema.propagators:
+                # 无法登记合并前的匹配器时不做合并，保证 get_propagator 仍能找到它们
+                for prog in propagators if lookup is not None else schema.propagators:
                     subscriber.propagate(prog)
-                
-                self._subscribers[id(cube)] = subscriber
-            
+                    if isinstance(prog, MatcherChain):
+                        # 使 subscriber.get_propagator(DetectPrefix) 等仍返回原匹配器
+                        for member in prog.matchers:
+                            lookup.add(member)
+
+                subscribers.append(subscriber)
+                self.index.add(event_type)
+
+            self._subscribers[id(cube)] = subscribers
+            for matcher in _routed_matchers(schema):
+                entry = self._routed.setdefault(id(matcher), [matcher, 0])
+                entry[1] += 1
+                if entry[1] == 1:
+                    matcher.register()
             return True
         return None
 
     def release(self, cube: Cube) -> Any:
         if isinstance(cube.schema, ListenerSchema):
             if id(cube) in self._subscribers:
-                subscriber = self._subscribers.pop(id(cube))
-                if hasattr(subscriber, "dispose"):
-                    subscriber.dispose()
-                else:
-                    from litetower.logging import logger
-                    logger.warning(f"Subscriber {subscriber} has no dispose method.")
+                for subscriber in self._subscribers.pop(id(cube)):
+                    if hasattr(subscriber, "dispose"):
+                        subscriber.dispose()
+                    else:
+                        from litetower.logging import logger
+                        logger.warning(f"Subscriber {subscriber} has no dispose method.")
+                for event_type in cube.schema.events:
+                    self.index.remove(event_type)
+                for matcher in _routed_matchers(cube.schema):
+                    entry = self._routed.get(id(matcher))
+                    if entry is None:
+                        continue
+                    entry[1] -= 1
+                    if entry[1] <= 0:
+                        del self._routed[id(matcher)]
+                        matcher.unregister()
             return True
         return None
+
+
+def _routed_matchers(schema: ListenerSchema) -> List[Any]:
+    """监听器上注册了全局路由 (前缀 / 关键字 / 模式) 的匹配器，同一对象只计一次"""
+    seen: Dict[int, Any] = {}
+    for item in [*schema.propagators, *schema.providers]:
+        if callable(getattr(item, "register", None)) and callable(getattr(item, "unregister", None)):
+            seen.setdefault(id(item), item)
+    return list(seen.values())
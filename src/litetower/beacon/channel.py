@@ -4,6 +4,7 @@ from contextvars import ContextVar
 from typing import Any, Callable, List, Optional, Type, Union
 
 from .cube import Cube
+from .loading import LoadProfile
 from .schema import BaseSchema
 
 _current_channel: ContextVar["Channel"] = ContextVar("beacon_current_channel")
@@ -19,6 +20,8 @@ class Channel:
     content: List[Cube]
     
     _export: Any = None
+    profile: Optional[LoadProfile] = None
+    """加载耗时，加载完成后由 Beacon 填入"""
 
     def __init__(self, module: str):
         self.module = module
@@ -0,0 +1,171 @@
+"""插件批量加载的辅助工具。
+
+- ``prefetch``：在线程池中查找模块、读取源码与字节码，并扫描模块顶层的 ``require(...)`` 依赖
+- ``LoadProfile``：每个 Channel 的导入 / 分配耗时
+- ``write_chrome_trace``：将加载过程写为 Chrome trace (``chrome://tracing`` / Perfetto 可打开)
+"""
+
+from __future__ import annotations
+
+import ast
+import importlib.util
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+
+@dataclass
+class LoadProfile:
+    """插件加载耗时 (秒)"""
+
+    module: str
+    started: float = 0.0
+    """开始加载的时间 (``time.perf_counter``)"""
+    import_time: float = 0.0
+    """执行模块代码的耗时，包含其中嵌套 ``require`` 的插件"""
+    allocate_time: float = 0.0
+    """``Behaviour.allocate`` 分配监听器的耗时"""
+    prefetch_started: float = 0.0
+    prefetch_time: float = 0.0
+    """``require_all`` 中在线程池预读模块的耗时"""
+    prefetch_thread: int = 0
+    requires: List[str] = field(default_factory=list)
+    """模块顶层 ``require`` 的插件"""
+
+    @property
+    def total(self) -> float:
+        return self.import_time + self.allocate_time
+
+
+@dataclass
+class Prefetched:
+    """预读的模块"""
+
+    spec: ModuleSpec
+    code: CodeType
+    requires: List[str]
+    started: float
+    elapsed: float
+    thread: int
+
+
+class _RequireScanner(ast.NodeVisitor):
+    """收集 ``require("...")`` / ``xxx.require("...")`` 调用，不进入函数与类体"""
+
+    def __init__(self) -> None:
+        self.found: List[str] = []
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+        if (
+            name == "require"
+            and node.args
+            and isinstance(node.args[0], ast.Constant)
+            and isinstance(node.args[0].value, str)
+            and node.args[0].value not in self.found
+        ):
+            self.found.append(node.args[0].value)
+        self.generic_visit(node)
+
+    def _skip(self, node: ast.AST) -> None:
+        return None
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = visit_Lambda = _skip
+
+
+def scan_requires(source: str) -> List[str]:
+    """模块顶层 require 的插件名"""
+    scanner = _RequireScanner()
+    scanner.visit(ast.parse(source))
+    return scanner.found
+
+
+def prefetch(module: str) -> Optional[Prefetched]:
+    """查找模块并读取其字节码；无法预读时返回 None，由常规导入处理 (及报错)。
+
+    调用前父包需已导入，避免在工作线程中执行包代码。
+    """
+    started = time.perf_counter()
+    try:
+        spec = importlib.util.find_spec(module)
+        loader = spec.loader if spec is not None else None
+        if spec is None or not hasattr(loader, "get_code"):
+            return None
+        source = loader.get_source(module) if hasattr(loader, "get_source") else None  # type: ignore[union-attr]
+        code = loader.get_code(module)  # type: ignore[union-attr]
+        requires = scan_requires(source) if source else []
+    except Exception:
+        return None
+    if code is None:
+        return None
+    return Prefetched(
+        spec=spec,
+        code=code,
+        requires=requires,
+        started=started,
+        elapsed=time.perf_counter() - started,
+        thread=threading.get_ident(),
+    )
+
+
+def write_chrome_trace(
+    path: Union[str, Path], profiles: Iterable[LoadProfile], origin: float
+) -> None:
+    """将加载耗时写为 Chrome trace 事件 (时间相对 ``origin``，单位 µs)"""
+    pid = os.getpid()
+    main = threading.main_thread().ident or 0
+    events: List[Dict[str, Any]] = []
+    threads = {main: "beacon"}
+
+    def span(name: str, cat: str, start: float, duration: float, tid: int, **args: Any) -> None:
+        events.append(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            }
+        )
+
+    for profile in profiles:
+        if profile.prefetch_thread:
+            threads.setdefault(profile.prefetch_thread, f"prefetch-{len(threads)}")
+            span(
+                profile.module,
+                "prefetch",
+                profile.prefetch_started,
+                profile.prefetch_time,
+                profile.prefetch_thread,
+            )
+        span(
+            profile.module,
+            "import",
+            profile.started,
+            profile.import_time,
+            main,
+            requires=profile.requires,
+        )
+        span(
+            profile.module,
+            "allocate",
+            profile.started + profile.import_time,
+            profile.allocate_time,
+            main,
+        )
+
+    for tid, name in threads.items():
+        events.append(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+        )
+    Path(path).write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
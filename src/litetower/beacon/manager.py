@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import importlib
+import importlib.util
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Union
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from .behaviour import Behaviour
 from .channel import Channel, _current_channel
+from .loading import LoadProfile, Prefetched, prefetch, write_chrome_trace
 from litetower.logging import logger
 
 
@@ -28,19 +33,32 @@ class Beacon:
 
     def require(self, module: str) -> Union[Channel, Any]:
         """Import a module as a Beacon Channel."""
+        return self._require(module)
+
+    def _require(self, module: str, prefetched: Optional[Prefetched] = None) -> Union[Channel, Any]:
         if module in self.channels:
             channel = self.channels[module]
             return channel._export or channel
 
         channel = Channel(module)
         token = _current_channel.set(channel)
-        
+        profile = LoadProfile(module, started=time.perf_counter())
+        if prefetched is not None:
+            profile.requires = prefetched.requires
+            profile.prefetch_started = prefetched.started
+            profile.prefetch_time = prefetched.elapsed
+            profile.prefetch_thread = prefetched.thread
+
         try:
             logger.debug(f"Loading module: {module}")
             if module in sys.modules:
                 imported_module = importlib.reload(sys.modules[module])
+            elif prefetched is not None:
+                imported_module = self._exec_module(module, prefetched)
             else:
                 imported_module = importlib.import_module(module)
+            allocate_started = time.perf_counter()
+            profile.import_time = allocate_started - profile.started
             
             # Process cubes with registered behaviours
             for cube in channel.content:
@@ -50,9 +68,14 @@ class Beacon:
                     except Exception as e:
                         logger.error(f"Error allocating cube {cube}: {e}")
                         raise
+            profile.allocate_time = time.perf_counter() - allocate_started
 
+            channel.profile = profile
             self.channels[module] = channel
-            logger.info(f"Module loaded: {module}")
+            logger.info(
+                f"Module loaded: {module} "
+                f"(import {profile.import_time * 1e3:.1f} ms, allocate {profile.allocate_time * 1e3:.1f} ms)"
+            )
             
             return channel._export or channel
             
@@ -65,6 +88,89 @@ class Beacon:
         finally:
             _current_channel.reset(token)
 
+    @staticmethod
+    def _exec_module(module: str, prefetched: Prefetched) -> Any:
+        """以预读的字节码执行模块，等价于 ``importlib.import_module``"""
+        imported_module = importlib.util.module_from_spec(prefetched.spec)
+        sys.modules[module] = imported_module
+        exec(prefetched.code, imported_module.__dict__)
+        # 与导入系统一致：模块可能在执行时替换了 sys.modules 中的自身
+        imported_module = sys.modules[module]
+        parent, _, child = module.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, imported_module)
+        return imported_module
+
+    def require_all(
+        self,
+        modules: Iterable[str],
+        *,
+        max_workers: Optional[int] = None,
+        trace: Optional[Union[str, Path]] = None,
+    ) -> Dict[str, Union[Channel, Any]]:
+        """批量加载插件。
+
+        - 各模块的查找、源码与字节码读取在线程池中并发进行
+        - 按模块顶层的 ``require("...")`` 解析依赖，被依赖的插件先加载；循环依赖抛出 ``ValueError``
+        - 模块代码与 ``Behaviour.allocate`` 仍在当前线程依次执行，某个插件一旦预读完成即可开始执行，
+          与其余插件的预读重叠
+        - 每个 Channel 的耗时记录在 ``channel.profile``，``trace`` 指定路径时写出 Chrome trace
+
+        返回模块名 -> ``require`` 的返回值。
+        """
+        modules = list(dict.fromkeys(modules))
+        origin = time.perf_counter()
+        pending = [m for m in modules if m not in self.channels and m not in sys.modules]
+        # 父包在当前线程导入，工作线程中只做查找与读取
+        for module in pending:
+            parent = module.rpartition(".")[0]
+            if parent:
+                importlib.import_module(parent)
+
+        results: Dict[str, Union[Channel, Any]] = {}
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="beacon-prefetch") as pool:
+            futures: Dict[str, Future[Optional[Prefetched]]] = {
+                module: pool.submit(prefetch, module) for module in pending
+            }
+            visiting: List[str] = []
+
+            def load(module: str) -> Union[Channel, Any]:
+                if module in results:
+                    return results[module]
+                if module in visiting:
+                    cycle = " -> ".join([*visiting[visiting.index(module) :], module])
+                    raise ValueError(f"插件循环依赖: {cycle}")
+                prefetched = futures[module].result() if module in futures else None
+                visiting.append(module)
+                try:
+                    for dependency in prefetched.requires if prefetched else ():
+                        if dependency in futures:
+                            load(dependency)
+                finally:
+                    visiting.pop()
+                result = results[module] = self._require(module, prefetched)
+                return result
+
+            for module in modules:
+                load(module)
+
+        profiles = [
+            channel.profile
+            for module in modules
+            if (channel := self.channels.get(module)) is not None
+            and channel.profile is not None
+            and channel.profile.started >= origin
+        ]
+        if profiles:
+            slowest = sorted(profiles, key=lambda p: p.total, reverse=True)
+            logger.info(
+                f"Loaded {len(profiles)} modules in {(time.perf_counter() - origin) * 1e3:.1f} ms, slowest: "
+                + ", ".join(f"{p.module} {p.total * 1e3:.1f} ms" for p in slowest[:3])
+            )
+        if trace is not None:
+            write_chrome_trace(trace, profiles, origin)
+        return {module: results[module] for module in modules}
+
     def install_behaviour(self, behaviour: Behaviour):
         self.behaviours.append(behaviour)
 
@@ -1,6 +1,16 @@
 """配置模块"""
 
+from litetower.config.api import ApiConfig as ApiConfig
+from litetower.config.api import DownloadConfig as DownloadConfig
+from litetower.config.api import MediaCacheConfig as MediaCacheConfig
+from litetower.config.api import RateLimitConfig as RateLimitConfig
+from litetower.config.api import RetryConfig as RetryConfig
+from litetower.config.api import RouteLimit as RouteLimit
+from litetower.config.api import RouteRetry as RouteRetry
 from litetower.config.debug import DebugConfig as DebugConfig
 from litetower.config.debug import WebHookDebugConfig as WebHookDebugConfig
+from litetower.config.outbound import OutboundConfig as OutboundConfig
+from litetower.config.server import DedupConfig as DedupConfig
 from litetower.config.server import FileServerConfig as FileServerConfig
+from litetower.config.server import IngressConfig as IngressConfig
 from litetower.config.server import WebHookConfig as WebHookConfig
@@ -0,0 +1,136 @@
+"""开放平台 API 客户端配置"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Set
+
+from pydantic import BaseModel
+
+
+class RouteLimit(BaseModel):
+    """单个路由的令牌桶限额"""
+
+    rate: float
+    """每秒补充的令牌数"""
+    burst: Optional[float] = None
+    """桶容量，为 None 时等于 rate (至少为 1)"""
+    per_target: bool = True
+    """是否按目标 (群 / 用户 / 子频道) 分别计数，为 False 时整个路由共用一个桶"""
+
+
+class RateLimitConfig(BaseModel):
+    """按路由与目标的令牌桶限流配置
+
+    未配置的路由默认不限速，直到收到 429 或频率限制错误码后
+    按 learn_initial_rate 开始限速，之后按 AIMD 自适应调整。
+    """
+
+    enabled: bool = True
+    routes: Dict[str, RouteLimit] = {}
+    """路由模板 (见 ``API_PATHS``，如 ``/v2/groups/{target_id}/messages``) -> 限额"""
+    learn: bool = True
+    """是否根据 429 / Retry-After / 频率限制错误码自适应调整速率"""
+    learn_initial_rate: float = 5.0
+    """未配置限额的路由首次被限流时采用的速率"""
+    learn_increase: float = 0.1
+    """学习到的速率每次成功请求后的加性增长"""
+    learn_max_rate: float = 50.0
+    """未配置限额的路由学习到的速率恢复到该值后解除限速"""
+    min_rate: float = 0.2
+    """自适应速率的下限"""
+    throttle_backoff: float = 1.0
+    """被限流且响应未给出 Retry-After 时的暂停秒数"""
+    max_retries: int = 3
+    """被限流后重新排队发送的最大次数"""
+    max_wait: Optional[float] = 30.0
+    """单次请求在本地排队的最长秒数，为 None 时不限制"""
+    max_buckets: int = 10_000
+    """令牌桶数量超过该值时回收空闲桶"""
+
+
+class RouteRetry(BaseModel):
+    """单个路由的重试分类，未设置的字段沿用全局配置"""
+
+    max_attempts: Optional[int] = None
+    """总尝试次数 (含首次)"""
+    statuses: Optional[Set[int]] = None
+    """可重试的 HTTP 状态码"""
+    codes: Set[int] = set()
+    """额外可重试的业务错误码"""
+    replay: Optional[bool] = None
+    """可能已被平台受理的请求 (5xx、读超时等) 能否重发；
+    为 None 时仅幂等方法与带 ``msg_seq`` 的消息体重发，其余请求只重试未发出的连接错误"""
+
+
+class RetryConfig(BaseModel):
+    """瞬时故障重试配置
+
+    重试复用同一份请求体，消息发送的 msg_seq 保持不变，由平台负责去重。
+    请求可能已被平台受理时 (5xx、读超时等)，默认只重发幂等方法与带 msg_seq 的请求；
+    频道 / 私信消息等其余 POST 只在连接未建立 (请求未发出) 时重试，可按路由以 ``RouteRetry.replay`` 放开。
+    退避时间为 [0, min(max_delay, base_delay * 2^n)] 内的随机值 (full jitter)。
+    """
+
+    enabled: bool = True
+    max_attempts: int = 3
+    """总尝试次数 (含首次)"""
+    base_delay: float = 0.5
+    """首次重试的退避上限 (秒)"""
+    max_delay: float = 8.0
+    """单次退避上限 (秒)"""
+    budget: float = 20.0
+    """单个请求含重试的总耗时预算 (秒)，超出后不再重试"""
+    statuses: Set[int] = {500, 502, 503, 504}
+    """可重试的 HTTP 状态码"""
+    codes: Set[int] = set()
+    """可重试的业务错误码"""
+    transport_errors: bool = True
+    """是否重试超时、连接重置等传输层错误"""
+    routes: Dict[str, RouteRetry] = {}
+    """路由模板 -> 重试分类"""
+
+
+class MediaCacheConfig(BaseModel):
+    """已上传媒体 file_info 缓存配置
+
+    以 (目标类型, 文件类型, 内容哈希或 URL) 为键，在平台返回的 ttl 内复用 file_info。
+    """
+
+    enabled: bool = True
+    capacity: int = 1024
+    """最多缓存的条目数，超出后按 LRU 淘汰"""
+    default_ttl: float = 3600.0
+    """平台未返回 ttl 时的有效期 (秒)"""
+    margin: float = 60.0
+    """提前失效的安全余量 (秒)"""
+    persist_path: Optional[str] = None
+    """持久化文件路径，为 None 时仅缓存在内存中"""
+    persist_interval: float = 30.0
+    """持久化写盘的最小间隔 (秒)"""
+
+
+class DownloadConfig(BaseModel):
+    """附件下载配置"""
+
+    max_concurrency: int = 8
+    """全局同时进行的下载数上限"""
+    chunk_size: int = 1 << 16
+    """流式读取的块大小 (字节)"""
+    cache: bool = True
+    """是否启用磁盘缓存；同一附件在缓存内只下载一次"""
+    cache_dir: Optional[str] = None
+    """缓存目录，为 None 时使用系统临时目录下按用户区分的 ``litetower-attachments-<uid>``；
+    目录不存在时以 0700 权限创建，不属于当前用户或其他用户可访问时改用本进程独占的临时目录"""
+    cache_size: int = 512 * 1024 * 1024
+    """缓存总大小上限 (字节)，超出后按 LRU 淘汰"""
+    prefetch: bool = False
+    """带附件的消息事件在发布时立即开始下载，供 ``AttachmentData`` / ``list[bytes]`` 注入使用"""
+
+
+class ApiConfig(BaseModel):
+    """开放平台 API 客户端配置"""
+
+    ratelimit: RateLimitConfig = RateLimitConfig()
+    retry: RetryConfig = RetryConfig()
+    media_cache: MediaCacheConfig = MediaCacheConfig()
+    download: DownloadConfig = DownloadConfig()
@@ -0,0 +1,14 @@
+"""发送队列配置"""
+
+from pydantic import BaseModel
+
+
+class OutboundConfig(BaseModel):
+    """按目标分道的有序发送队列配置"""
+
+    max_concurrency: int = 64
+    """所有发送通道同时进行中的请求上限，0 表示不限制"""
+    idle_timeout: float = 60.0
+    """发送通道空闲多少秒后回收"""
+    drain_timeout: float = 10.0
+    """停止时等待未发送消息的最长秒数"""
@@ -1,6 +1,42 @@
+from typing import Literal, Optional
+
 from pydantic import BaseModel
 
 
+class IngressConfig(BaseModel):
+    """webhook 入站队列配置
+
+    启用后 webhook 在解码出 OP 0 负载后立即 ACK，
+    事件校验、构建与分发交由后台 worker 池完成。
+    """
+
+    enabled: bool = False
+    """是否启用入站队列，关闭时在请求内同步分发"""
+    maxsize: int = 1024
+    """队列容量上限"""
+    workers: int = 8
+    """并发分发的 worker 数量"""
+    overflow: Literal["block", "drop_oldest", "reject"] = "block"
+    """队列已满时的处理策略: 阻塞等待 / 丢弃最旧事件 / 返回 503"""
+    drain_timeout: float = 5.0
+    """停止时等待队列排空的最长秒数"""
+
+
+class DedupConfig(BaseModel):
+    """webhook 去重配置"""
+
+    enabled: bool = True
+    """是否对重投的事件去重"""
+    mode: Literal["lru", "bloom"] = "lru"
+    """去重结构: 精确的分桶 TTL-LRU / 固定内存的 Bloom filter"""
+    ttl: float = 300.0
+    """事件 id 的保留秒数"""
+    capacity: int = 100_000
+    """最多记录的事件 id 数 (Bloom 模式下为每代的预期容量)"""
+    error_rate: float = 0.001
+    """Bloom 模式的误判率"""
+
+
 class WebHookConfig(BaseModel):
     """webhook 配置"""
 
@@ -10,6 +46,18 @@ class WebHookConfig(BaseModel):
     """webhook 的 port"""
     postevent: str = "/postevent"
     """webhook 的 postevent url"""
+    skip_unsubscribed: bool = False
+    """没有 Beacon 监听器的事件类型直接 ACK 而不构建事件。
+    直接通过 ``leto.on`` 注册的监听器不计入索引，仅在所有监听器均经 Beacon 加载时开启"""
+    json_backend: str = "auto"
+    """请求体 JSON 解析后端: auto / orjson / pydantic / json 或自行注册的后端名"""
+    compact_events: bool = False
+    """消息事件使用紧凑表示：作者、群等嵌套字段跳过 pydantic 校验直接构建，附件等按需解析。
+    事件与字段的类型均与默认事件一致"""
+    ingress: IngressConfig = IngressConfig()
+    """入站队列配置"""
+    dedup: DedupConfig = DedupConfig()
+    """重投去重配置"""
 
 
 class FileServerConfig(BaseModel):
@@ -17,3 +65,23 @@ class FileServerConfig(BaseModel):
     """本地文件路径"""
     remote_url: str = "/fileserver"
     """远程文件路径"""
+    public_url: Optional[str] = None
+    """文件服务器对外可访问的根地址 (如 ``https://bot.example.com``)，启用 stage_media 时必填"""
+    stage_media: bool = False
+    """上传内存/本地媒体时先写入文件服务器目录，再以 URL 方式上传"""
+    stage_dir: str = "litetower-media"
+    """暂存媒体在 localpath 下的子目录"""
+    stage_ttl: float = 3600.0
+    """暂存文件的保留秒数，过期后被清理"""
+    gc_interval: float = 600.0
+    """清理过期暂存文件的最小间隔 (秒)"""
+    max_transfers: int = 64
+    """同时进行的文件传输上限，0 表示不限制"""
+    max_transfers_per_client: int = 4
+    """单个客户端同时进行的文件传输上限，0 表示不限制"""
+    cache_max_age: int = 3600
+    """非内容寻址文件的 Cache-Control max-age (秒)"""
+    host: Optional[str] = None
+    """独立监听地址，为 None 时沿用 webhook 的 host"""
+    port: Optional[int] = None
+    """独立监听端口；设置后文件服务器不再挂载在 webhook 服务上"""
@@ -0,0 +1,119 @@
+"""消息附件内容的依赖注入。
+
+处理器可直接声明 ``AttachmentData`` 或 ``list[bytes]`` 参数获取事件附件的内容。
+同一事件的每个附件只启动一个下载任务，由该事件的所有订阅者共享；
+各附件并发下载，与其他处理器的执行相互重叠。
+
+开启 ``DownloadConfig.prefetch`` 后，带附件的消息事件在发布时即开始下载。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import arclet.letoderea as leto
+
+from litetower.models.elements import Attachment
+
+_eager = False
+_tasks: Dict[int, List[asyncio.Task[bytes]]] = {}
+
+
+class AttachmentData:
+    """消息附件及其内容"""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Tuple[Attachment, bytes]]):
+        self.items = items
+
+    @property
+    def attachments(self) -> List[Attachment]:
+        return [attachment for attachment, _ in self.items]
+
+    @property
+    def data(self) -> List[bytes]:
+        return [data for _, data in self.items]
+
+    def __iter__(self) -> Iterator[Tuple[Attachment, bytes]]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __bool__(self) -> bool:
+        return bool(self.items)
+
+
+def configure_prefetch(eager: bool) -> None:
+    """设置是否在事件发布时立即开始下载附件"""
+    global _eager
+    _eager = eager
+
+
+def _attachments_of(event: Any) -> List[Attachment]:
+    attachments = getattr(event, "attachments", None)
+    return attachments.attachments if attachments else []
+
+
+def prefetch(event: Any) -> List[asyncio.Task[bytes]]:
+    """启动 (或取回已启动的) 事件附件下载任务，每个附件一个任务"""
+    key = id(event)
+    tasks = _tasks.get(key)
+    if tasks is None:
+        from litetower.models.elements import _require_downloader
+
+        downloader = _require_downloader()
+        tasks = [
+            asyncio.ensure_future(downloader.read(attachment))
+            for attachment in _attachments_of(event)
+        ]
+        for task in tasks:
+            task.add_done_callback(_retrieve_exception)
+        _tasks[key] = tasks
+        # 事件对象被回收时释放任务引用
+        weakref.finalize(event, _tasks.pop, key, None)
+    return tasks
+
+
+def on_dispatch(event: Any) -> None:
+    """事件发布时调用：开启 prefetch 且事件带附件时立即开始下载"""
+    if _eager and _attachments_of(event):
+        from litetower.models.elements import _current_downloader
+
+        if _current_downloader() is not None:
+            prefetch(event)
+
+
+async def get_attachment_data(ctx: leto.Contexts) -> Optional[AttachmentData]:
+    event = ctx.get(leto.EVENT)
+    if event is None:
+        return None
+    attachments = _attachments_of(event)
+    if not attachments:
+        return AttachmentData([])
+    data = await asyncio.gather(*(asyncio.shield(task) for task in prefetch(event)))
+    return AttachmentData(list(zip(attachments, data)))
+
+
+async def get_attachment_bytes(ctx: leto.Contexts) -> Optional[List[bytes]]:
+    result = await get_attachment_data(ctx)
+    return None if result is None else result.data
+
+
+def _is_bytes_list(param: Any) -> bool:
+    return param.annotation in (list[bytes], List[bytes])
+
+
+attachment_providers = [
+    leto.provide(AttachmentData, call=get_attachment_data),
+    leto.provide(list[bytes], call=get_attachment_bytes, validate=_is_bytes_list),
+]
+"""消息事件共用的附件内容 Provider"""
+
+
+def _retrieve_exception(future: asyncio.Future[Any]) -> None:
+    if not future.cancelled():
+        future.exception()
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+from dataclasses import fields
+from typing import Any, Dict, List, Tuple
+
 import arclet.letoderea as leto
 
 from litetower.models.target import Target
 
+_field_names: Dict[type, Tuple[str, ...]] = {}
+
 
 def get_event_target(ctx: leto.Contexts) -> Target | None:
     """从 Contexts 中安全获取事件的 target 属性。
@@ -16,3 +21,31 @@ def get_event_target(ctx: leto.Contexts) -> Target | None:
     if event is not None and hasattr(event, "target"):
         return event.target  # type: ignore[no-any-return]
     return None
+
+
+async def gather_event(event: Any, ctx: leto.Contexts) -> None:
+    """将事件字段写入 Contexts。
+
+    ``__lazy_fields__`` 中的字段 (紧凑事件按需解析的字段) 不在此处读取，
+    而是由 ``lazy_field_providers`` 在处理器实际需要时提供。
+    """
+    cls = type(event)
+    names = _field_names.get(cls)
+    if names is None:
+        lazy = getattr(cls, "__lazy_fields__", ())
+        names = _field_names[cls] = tuple(f.name for f in fields(cls) if f.name not in lazy)
+    ctx.update({name: getattr(event, name) for name in names})
+
+
+def lazy_field_providers(*names: str) -> List[leto.Provider[Any]]:
+    """按参数名从事件上读取字段的 Provider"""
+
+    def provider(name: str) -> leto.Provider[Any]:
+        return leto.provide(
+            object,
+            name,
+            call=lambda ctx: getattr(ctx.get(leto.EVENT), name, None),
+            validate=lambda param: param.name == name,
+        )
+
+    return [provider(name) for name in names]
@@ -0,0 +1,177 @@
+"""紧凑消息事件。
+
+``WebHookConfig(compact_events=True)`` 时 webhook 以这些子类代替默认的消息事件：
+
+- 作者、群、群成员等嵌套字段仍是对应的 pydantic 模型实例，但直接由原始 dict 构建，
+  不经过校验 (见 ``litetower.models.compact``)
+- 附件、提及、消息场景、频道成员只保留各自的原始子对象，首次访问时才解析，解析后即释放；
+  事件不持有整个原始负载 dict
+- ``target`` 每个事件只构建一次
+
+它们是对应事件类的子类，订阅 ``GroupMessage`` 等的处理器照常收到事件，属性与类型保持兼容；
+按需解析的字段由事件的 Provider 提供，分发时不会被提前读取。
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+from litetower.events.message import (
+    C2CMessage,
+    ChannelMessage,
+    DirectMessage,
+    GroupMessage,
+)
+from litetower.models.author import Author
+from litetower.models.compact import construct
+from litetower.models.content import Content
+from litetower.models.elements import Attachments
+from litetower.models.elements.guild import GuildMember, Mention
+from litetower.models.elements.normal import Group, Member
+from litetower.models.scene import MessageScene
+from litetower.models.target import Target
+
+
+def _pending(d: Dict[str, Any], names: Tuple[str, ...]) -> Dict[str, Any]:
+    """按需解析字段对应的原始子对象"""
+    return {name: d[name] for name in names if d.get(name) is not None}
+
+
+def _attachments(value: Any) -> Optional[Attachments]:
+    return Attachments.model_validate(value) if value is not None else None
+
+
+def _message_scene(value: Any) -> Optional[MessageScene]:
+    return construct(MessageScene, value) if value is not None else None
+
+
+class CompactGroupMessage(GroupMessage):
+    """紧凑的 ``GroupMessage``"""
+
+    __lazy_fields__ = ("message_scene", "attachments")
+
+    def __init__(self, d: Dict[str, Any], payload_id: str):
+        self._pending = _pending(d, self.__lazy_fields__)
+        self.id = d.get("id") or payload_id
+        self.content = Content(d.get("content") or "")
+        self.timestamp = str(d.get("timestamp") or "")
+        self.author = construct(Author, d.get("author"))
+        self.group = construct(
+            Group,
+            group_id=d.get("group_id") or "",
+            group_openid=d.get("group_openid") or "",
+        )
+        self.member = construct(Member, member_openid=self.author.member_openid or "")
+
+    @cached_property
+    def message_scene(self) -> Optional[MessageScene]:
+        return _message_scene(self._pending.pop("message_scene", None))
+
+    @cached_property
+    def attachments(self) -> Optional[Attachments]:
+        return _attachments(self._pending.pop("attachments", None))
+
+    @cached_property
+    def target(self) -> Target:
+        return super().target
+
+
+class CompactC2CMessage(C2CMessage):
+    """紧凑的 ``C2CMessage``"""
+
+    __lazy_fields__ = ("message_scene", "attachments")
+
+    def __init__(self, d: Dict[str, Any], payload_id: str):
+        self._pending = _pending(d, self.__lazy_fields__)
+        self.id = d.get("id") or payload_id
+        self.content = Content(d.get("content") or "")
+        self.timestamp = str(d.get("timestamp") or "")
+        self.author = construct(Author, d.get("author"))
+        if openid := d.get("openid"):
+            self.author.user_openid = openid
+
+    @cached_property
+    def message_scene(self) -> Optional[MessageScene]:
+        return _message_scene(self._pending.pop("message_scene", None))
+
+    @cached_property
+    def attachments(self) -> Optional[Attachments]:
+        return _attachments(self._pending.pop("attachments", None))
+
+    @cached_property
+    def target(self) -> Target:
+        return super().target
+
+
+class CompactChannelMessage(ChannelMessage):
+    """紧凑的 ``ChannelMessage``"""
+
+    __lazy_fields__ = ("mentions", "member", "attachments")
+
+    def __init__(self, d: Dict[str, Any], payload_id: str):
+        self._pending = _pending(d, self.__lazy_fields__)
+        self.id = d.get("id") or payload_id
+        self.content = Content(d.get("content") or "")
+        self.timestamp = str(d.get("timestamp") or "")
+        self.author = construct(Author, d.get("author"))
+        self.channel_id = d.get("channel_id") or ""
+        self.guild_id = d.get("guild_id") or ""
+        self.seq = int(d.get("seq") or 0)
+        self.seq_in_channel = int(d.get("seq_in_channel") or 0)
+
+    @cached_property
+    def mentions(self) -> List[Mention]:
+        return [Mention.model_validate(m) for m in self._pending.pop("mentions", None) or []]
+
+    @cached_property
+    def member(self) -> GuildMember:
+        return construct(GuildMember, self._pending.pop("member", None))
+
+    @cached_property
+    def attachments(self) -> Optional[Attachments]:
+        return _attachments(self._pending.pop("attachments", None))
+
+    @cached_property
+    def target(self) -> Target:
+        return super().target
+
+
+class CompactDirectMessage(DirectMessage):
+    """紧凑的 ``DirectMessage``"""
+
+    __lazy_fields__ = ("member", "attachments")
+
+    def __init__(self, d: Dict[str, Any], payload_id: str):
+        self._pending = _pending(d, self.__lazy_fields__)
+        self.id = d.get("id") or payload_id
+        self.content = Content(d.get("content") or "")
+        self.timestamp = str(d.get("timestamp") or "")
+        self.author = construct(Author, d.get("author"))
+        self.channel_id = d.get("channel_id") or ""
+        self.guild_id = d.get("guild_id") or ""
+        self.seq = int(d.get("seq") or 0)
+        self.seq_in_channel = int(d.get("seq_in_channel") or 0)
+        self.direct_message = d.get("direct_message") or False
+        self.src_guild_id = d.get("src_guild_id") or ""
+
+    @cached_property
+    def member(self) -> GuildMember:
+        return construct(GuildMember, self._pending.pop("member", None))
+
+    @cached_property
+    def attachments(self) -> Optional[Attachments]:
+        return _attachments(self._pending.pop("attachments", None))
+
+    @cached_property
+    def target(self) -> Target:
+        return super().target
+
+
+COMPACT_EVENTS: Dict[str, type] = {
+    "GROUP_AT_MESSAGE_CREATE": CompactGroupMessage,
+    "C2C_MESSAGE_CREATE": CompactC2CMessage,
+    "AT_MESSAGE_CREATE": CompactChannelMessage,
+    "DIRECT_MESSAGE_CREATE": CompactDirectMessage,
+}
+"""事件类型 -> 紧凑事件类，构造参数与快速工厂相同 (原始 dict, 负载 id)"""
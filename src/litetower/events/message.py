@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import field
+from functools import cached_property
 from typing import List, Optional
 
 import arclet.letoderea as leto
 
-from litetower.events.common import get_event_target
+from litetower.events.attachments import attachment_providers
+from litetower.events.common import gather_event, get_event_target, lazy_field_providers
 from litetower.models.author import Author
 from litetower.models.content import Content
 from litetower.models.elements import Attachments
@@ -15,6 +17,7 @@ from litetower.models.elements.guild import GuildMember, Mention
 from litetower.models.elements.normal import Group, Member
 from litetower.models.scene import MessageScene
 from litetower.models.target import Target
+from litetower.utils.guild import Segment, parse_segments
 
 
 @leto.make_event
@@ -34,8 +37,12 @@ class GroupMessage:
     def target(self) -> Target:
         return Target(target_unit=self.group.group_openid, target_id=self.id)
 
+    gather = gather_event
+
     providers = [
         leto.provide(Target, "target", call=get_event_target),
+        *attachment_providers,
+        *lazy_field_providers("message_scene", "attachments"),
     ]
 
 
@@ -55,8 +62,12 @@ class C2CMessage:
         assert self.author.user_openid
         return Target(target_unit=self.author.user_openid, target_id=self.id)
 
+    gather = gather_event
+
     providers = [
         leto.provide(Target, "target", call=get_event_target),
+        *attachment_providers,
+        *lazy_field_providers("message_scene", "attachments"),
     ]
 
 
@@ -80,8 +91,17 @@ class ChannelMessage:
     def target(self) -> Target:
         return Target(target_unit=self.channel_id, target_id=self.id)
 
+    @cached_property
+    def segments(self) -> List[Segment]:
+        """按 @用户、#子频道、表情与 @全体成员 切分的消息片段，首次访问时解析"""
+        return parse_segments(self.content)
+
+    gather = gather_event
+
     providers = [
         leto.provide(Target, "target", call=get_event_target),
+        *attachment_providers,
+        *lazy_field_providers("mentions", "member", "attachments"),
     ]
 
 
@@ -106,8 +126,17 @@ class DirectMessage:
     def target(self) -> Target:
         return Target(target_unit=self.guild_id, target_id=self.id)
 
+    @cached_property
+    def segments(self) -> List[Segment]:
+        """按 @用户、#子频道、表情与 @全体成员 切分的消息片段，首次访问时解析"""
+        return parse_segments(self.content)
+
+    gather = gather_event
+
     providers = [
         leto.provide(Target, "target", call=get_event_target),
+        *attachment_providers,
+        *lazy_field_providers("member", "attachments"),
     ]
 
 
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import atexit
+import json
 import logging
+import random
 import sys
+import threading
+import traceback
 import types
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from logging import LogRecord
 from types import TracebackType
-from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union
+from typing import IO, Any, Callable, Deque, Dict, Iterable, List, Literal, Optional, Tuple, Type, Union
 
 from loguru import logger as loguru_logger
 from loguru._logger import Core
@@ -39,16 +46,34 @@ console = Console(
     )
 )
 
+_INFO_NO = 20
+_min_level_no = _INFO_NO
+"""setup_logging 配置的最低日志等级，用于在构建日志记录前快速判断"""
+
 
 class LoguruHandler(logging.Handler):
-    """Intercept standard logging messages and emit to Loguru."""
-    
+    """Intercept standard logging messages and emit to Loguru.
+
+    ``resolve_caller=False`` skips the stack walk used to attribute the record
+    to its caller; the stdlib logger name is passed as ``extra["logger_name"]`` instead.
+    """
+
+    def __init__(self, resolve_caller: bool = True):
+        super().__init__()
+        self.resolve_caller = resolve_caller
+
     def emit(self, record: logging.LogRecord) -> None:
         try:
             level = loguru_logger.level(record.levelname).name
         except ValueError:
             level = str(record.levelno)
 
+        if not self.resolve_caller:
+            loguru_logger.opt(exception=record.exc_info).log(
+                level, "{}", record.getMessage(), logger_name=record.name
+            )
+            return
+
         frame = logging.currentframe()
         depth = 2
         while frame and frame.f_code.co_filename == logging.__file__:
@@ -72,6 +97,13 @@ def highlight(style: str) -> Dict[str, Callable[[Text], Text]]:
 
 def _get_module_tag(name: str) -> Text:
     """Map raw module names to colorful tags."""
+    tag, style = _module_tag(name)
+    return Text(f"[{tag}]", style=style)
+
+
+@lru_cache(maxsize=256)
+def _module_tag(name: str) -> Tuple[str, str]:
+    """Map raw module names to (tag, style)."""
     name = name or ""
     tag = "System"
     style = "blue"
@@ -102,8 +134,8 @@ def _get_module_tag(name: str) -> Text:
         style = "green"
     elif name.startswith("httpx"):
         tag = "HTTPX"
-    
-    return Text(f"[{tag}]", style=style)
+
+    return tag, style
 
 
 class LoguruRichHandler(RichHandler):
@@ -140,7 +172,9 @@ class LoguruRichHandler(RichHandler):
         # 4. Handle Message (User's message with rich markup if enabled)
         # Add extra attrs handling from richuru
         extra: dict = getattr(record, "extra", {})
-        if "rich" in extra:
+        if "event_flow" in extra:
+            msg_content = extra["event_flow"].render()
+        elif "rich" in extra:
             msg_content = extra["rich"]
         elif "style" in extra:
             record.__dict__.update(highlight(extra["style"]))
@@ -176,6 +210,177 @@ class LoguruRichHandler(RichHandler):
         return final_output
 
 
+class EventFlowRecord:
+    """事件流日志记录。
+
+    只保存构建事件时已有的原始字段，Rich 文本在 sink 中按需渲染。
+    """
+
+    __slots__ = ("label", "scope", "target", "actor", "content", "note")
+
+    def __init__(
+        self,
+        label: str,
+        scope: str,
+        target: str,
+        actor: Optional[str] = None,
+        content: Optional[str] = None,
+        note: str = "Dispatching",
+    ):
+        self.label = label
+        self.scope = scope
+        self.target = target
+        self.actor = actor
+        self.content = content
+        self.note = note
+
+    def detail(self) -> str:
+        if self.content:
+            return f"{self.actor or '?'} 说: {self.content}"
+        return self.note
+
+    def render(self) -> Text:
+        # [Event] 群消息 from 群:xxx -> user 说: ...
+        return Text.assemble(
+            (self.label, "bold yellow"),
+            " from ",
+            (f"{self.scope}:{self.target}" if self.target else "Unknown", "blue"),
+            " -> ",
+            self.detail(),
+        )
+
+    def plain(self) -> str:
+        """不经过 Rich 的纯文本形式，与 ``render().plain`` 一致"""
+        source = f"{self.scope}:{self.target}" if self.target else "Unknown"
+        return f"{self.label} from {source} -> {self.detail()}"
+
+    def __str__(self) -> str:
+        return self.plain()
+
+
+class StructuredSink:
+    """JSON Lines / logfmt 结构化日志 sink。
+
+    记录在调用线程中只做入队，序列化与写出由后台线程批量完成，不经过 Rich。
+    ``overflow`` 决定缓冲区已满时的行为: 丢弃新记录 / 丢弃最旧记录 / 阻塞等待。
+    """
+
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        fmt: Literal["json", "logfmt"] = "json",
+        buffer_size: int = 65536,
+        overflow: Literal["drop_newest", "drop_oldest", "block"] = "drop_newest",
+        batch_size: int = 512,
+        flush_interval: float = 0.2,
+    ):
+        self.stream = stream or sys.stderr
+        self.fmt = fmt
+        self.buffer_size = max(buffer_size, 1)
+        self.overflow = overflow
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        """因缓冲区已满被丢弃的记录数"""
+        self._buffer: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="litetower-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message: Any) -> None:
+        record = message.record
+        with self._cond:
+            buffer = self._buffer
+            if len(buffer) >= self.buffer_size:
+                if self.overflow == "drop_newest":
+                    self.dropped += 1
+                    return
+                if self.overflow == "drop_oldest":
+                    buffer.popleft()
+                    self.dropped += 1
+                else:
+                    while len(buffer) >= self.buffer_size and not self._closed:
+                        self._cond.wait()
+            buffer.append(record)
+            if len(buffer) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._buffer) < self.batch_size and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(len(self._buffer), self.batch_size))
+                ]
+                closed = self._closed and not self._buffer
+                self._cond.notify_all()
+            if batch:
+                self._write(batch)
+            if closed:
+                return
+
+    def _write(self, batch: List[Any]) -> None:
+        serialize = self._to_json if self.fmt == "json" else self._to_logfmt
+        lines = []
+        for record in batch:
+            try:
+                lines.append(serialize(self._fields(record)))
+            except Exception as e:
+                lines.append(serialize({"level": "ERROR", "msg": f"log serialization failed: {e}"}))
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _fields(record: Dict[str, Any]) -> Dict[str, Any]:
+        extra = record["extra"]
+        name = extra.get("logger_name") or extra.get("name") or record["name"] or ""
+        flow = extra.get("event_flow")
+        fields: Dict[str, Any] = {
+            "ts": record["time"].isoformat(),
+            "level": record["level"].name,
+            "tag": _module_tag(name)[0],
+            "logger": name,
+            "msg": flow.plain() if flow is not None else record["message"],
+        }
+        for key, value in extra.items():
+            if key not in ("logger_name", "name", "event_flow", "rich", "style") and key not in fields:
+                fields[key] = value
+        if exc := record["exception"]:
+            fields["exc"] = "".join(
+                traceback.format_exception(exc.type, exc.value, exc.traceback)
+            )
+        return fields
+
+    @staticmethod
+    def _to_json(fields: Dict[str, Any]) -> str:
+        return json.dumps(fields, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def _to_logfmt(fields: Dict[str, Any]) -> str:
+        parts = []
+        for key, value in fields.items():
+            text = value if isinstance(value, str) else str(value)
+            if not text or any(c in text for c in ' ="\n'):
+                text = json.dumps(text, ensure_ascii=False)
+            parts.append(f"{key}={text}")
+        return " ".join(parts)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """写出剩余记录并停止后台线程"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+
 ExceptionHook = Callable[[Type[BaseException], BaseException, Optional[TracebackType]], Any]
 
 
@@ -183,13 +388,54 @@ def _loguru_exc_hook(typ: Type[BaseException], val: BaseException, tb: Optional[
     loguru_logger.opt(exception=(typ, val, tb)).error("Exception:")
 
 
+LogSink = Literal["rich", "json", "logfmt"]
+
+_structured_sink: Optional[StructuredSink] = None
+_sink_options: Dict[str, Any] = {"sink": "rich"}
+
+
 def setup_logging(
     level: str = "INFO",
     exc_hook: Optional[ExceptionHook] = _loguru_exc_hook,
+    sink: LogSink = "rich",
+    stream: Optional[IO[str]] = None,
+    buffer_size: int = 65536,
+    overflow: Literal["drop_newest", "drop_oldest", "block"] = "drop_newest",
 ) -> Any:
-    """Configure logging system"""
+    """Configure logging system
+
+    Args:
+        level: 最低日志等级
+        exc_hook: 未捕获异常钩子
+        sink: ``rich`` 为默认的彩色控制台输出；``json`` / ``logfmt`` 为结构化输出，
+            经环形缓冲区由后台线程批量写出
+        stream: 结构化输出的目标流，默认 stderr
+        buffer_size: 结构化输出的缓冲区容量
+        overflow: 缓冲区已满时的策略
+    """
+    global _min_level_no, _structured_sink, _sink_options
     loguru_logger.remove()
-    
+    if _structured_sink is not None:
+        _structured_sink.stop()
+        _structured_sink = None
+    _min_level_no = loguru_logger.level(level).no if isinstance(level, str) else int(level)
+    _sink_options = {
+        "sink": sink,
+        "stream": stream,
+        "buffer_size": buffer_size,
+        "overflow": overflow,
+    }
+
+    if sink != "rich":
+        logging.basicConfig(handlers=[LoguruHandler(resolve_caller=False)], level=0, force=True)
+        _structured_sink = StructuredSink(
+            stream=stream, fmt=sink, buffer_size=buffer_size, overflow=overflow
+        )
+        loguru_logger.add(_structured_sink, format="{message}", level=level)
+        if exc_hook is not None:
+            sys.excepthook = exc_hook
+        return loguru_logger
+
     # Intercept standard logging
     logging.basicConfig(handlers=[LoguruHandler()], level=0, force=True)
     
@@ -221,8 +467,14 @@ logger = loguru_logger
 setup_logging()
 
 
+@atexit.register
+def _stop_structured_sink() -> None:
+    if _structured_sink is not None:
+        _structured_sink.stop()
+
+
 def set_level(level: str) -> None:
-    setup_logging(level)
+    setup_logging(level, **_sink_options)
 
 
 def enable_debug() -> None:
@@ -254,6 +506,53 @@ def banner() -> None:
 # Helper Functions
 # ──────────────────────────────────────────
 
+EventFlowVerbosity = Literal["off", "brief", "full"]
+"""事件流日志详细度: 不记录 / 不含消息内容 / 完整"""
+
+_VERBOSITY_LEVELS: Dict[str, int] = {"off": 0, "brief": 1, "full": 2}
+_event_flow_default: Tuple[int, float] = (2, 1.0)
+_event_flow_overrides: Dict[str, Tuple[int, float]] = {}
+_event_logger = logger.bind(name="litetower.events")
+
+
+def configure_event_flow(
+    verbosity: EventFlowVerbosity = "full",
+    sample_rate: float = 1.0,
+    per_type: Optional[Dict[str, Tuple[EventFlowVerbosity, float]]] = None,
+) -> None:
+    """配置事件流日志。
+
+    Args:
+        verbosity: 默认详细度
+        sample_rate: 默认采样率 (0~1)
+        per_type: 按 webhook 事件类型 (如 ``"GROUP_AT_MESSAGE_CREATE"``) 覆盖 (详细度, 采样率)
+    """
+    global _event_flow_default, _event_flow_overrides
+    _event_flow_default = (_VERBOSITY_LEVELS[verbosity], sample_rate)
+    _event_flow_overrides = {
+        event_type: (_VERBOSITY_LEVELS[v], rate)
+        for event_type, (v, rate) in (per_type or {}).items()
+    }
+
+
+def event_flow_verbosity(event_type: str) -> int:
+    """本次事件应使用的详细度 (0 不记录, 1 简略, 2 完整)。
+
+    INFO 被过滤、该类型关闭或未被采样时返回 0，调用方据此跳过记录的构建。
+    """
+    if _min_level_no > _INFO_NO:
+        return 0
+    verbosity, rate = _event_flow_overrides.get(event_type, _event_flow_default)
+    if verbosity and rate < 1.0 and random.random() >= rate:
+        return 0
+    return verbosity
+
+
+def log_event_flow_record(record: EventFlowRecord) -> None:
+    """记录事件流，渲染推迟到 sink"""
+    _event_logger.info(record.label, event_flow=record)
+
+
 def log_event_flow(event_type: str, source: str, detail: str) -> None:
     """Log an incoming event flow"""
     # [Event] GroupMessage from Group(123) -> Dispatching
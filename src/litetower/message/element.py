@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import base64
-from io import BytesIO
+import hashlib
+import mmap
+import os
+from contextlib import closing, contextmanager
+from io import BytesIO, UnsupportedOperation
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, PrivateAttr
+
+Buffer = Union[bytes, memoryview]
 
 
 class Element(BaseModel):
@@ -16,24 +22,170 @@ class Element(BaseModel):
 
 
 class MediaElement(Element):
-    """媒体消息元素基类"""
+    """媒体消息元素基类
+
+    ``data_path`` / ``data_io`` 只保存文件路径或缓冲区引用，发送时才按需读取
+    (文件与带 ``fileno()`` 的文件对象通过 mmap 映射，其余流按块读取)。
+    此时访问 ``data`` 会读取完整内容 (每次访问都重新读取，不缓存)，
+    只需判断是否有内容时使用 ``has_data``，大文件使用 ``iter_chunks()`` / ``open_buffer()``。
+    """
 
-    data: bytes = b""
+    inline_data: bytes = Field(b"", alias="data")
+    """直接传入 (``data=`` / ``data_base64=``) 的内存内容"""
     url: Optional[str] = None
 
+    _path: Optional[Path] = PrivateAttr(None)
+    _io: Optional[IO[bytes]] = PrivateAttr(None)
+    _io_start: int = PrivateAttr(0)
+    _sha256: Optional[str] = PrivateAttr(None)
+
     class Config:
         arbitrary_types_allowed = True
+        populate_by_name = True
 
     def __init__(self, **kwargs: Any):
-        if "data_path" in kwargs:
-            path = Path(kwargs.pop("data_path"))
-            kwargs["data"] = path.read_bytes()
+        path = kwargs.pop("data_path", None)
+        io: Optional[IO[bytes]] = kwargs.pop("data_io", None)
         if "data_base64" in kwargs:
             kwargs["data"] = base64.b64decode(kwargs.pop("data_base64"))
-        if "data_io" in kwargs:
-            io: BytesIO = kwargs.pop("data_io")
+        if io is not None and not io.seekable():
+            # 不可回读的流无法重复发送，只能立即读入内存
             kwargs["data"] = io.read()
+            io = None
         super().__init__(**kwargs)
+        if path is not None:
+            self._path = Path(path)
+            if not self._path.is_file():
+                raise FileNotFoundError(self._path)
+        if io is not None:
+            self._io = io
+            self._io_start = io.tell()
+
+    def model_dump(self, **kwargs: Any) -> Dict[str, Any]:
+        kwargs.setdefault("by_alias", True)
+        return super().model_dump(**kwargs)
+
+    @property
+    def data(self) -> bytes:
+        """媒体内容；``data_path`` / ``data_io`` 构建的媒体每次访问时读取完整内容"""
+        return self.read_bytes()
+
+    @data.setter
+    def data(self, value: bytes) -> None:
+        self.inline_data = value
+        self._path = None
+        self._io = None
+        self._sha256 = None
+
+    @property
+    def lazy(self) -> bool:
+        """内容是否来自延迟读取的文件或缓冲区"""
+        return self._path is not None or self._io is not None
+
+    @property
+    def buffered(self) -> bool:
+        """内容能否以单个缓冲区访问 (``open_buffer``)；否则只能通过 ``iter_chunks`` 按块读取"""
+        return self._io is None or isinstance(self._io, BytesIO) or self._io_fileno() is not None
+
+    def _io_fileno(self) -> Optional[int]:
+        try:
+            return self._io.fileno()  # type: ignore[union-attr]
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    @property
+    def source_path(self) -> Optional[Path]:
+        """通过 ``data_path`` 引用的文件路径"""
+        return self._path
+
+    @property
+    def has_data(self) -> bool:
+        """是否携带媒体内容 (内存、文件或缓冲区)"""
+        return self.lazy or bool(self.inline_data)
+
+    @property
+    def size(self) -> int:
+        """媒体内容字节数"""
+        if self._path is not None:
+            return self._path.stat().st_size
+        if self._io is not None:
+            if isinstance(self._io, BytesIO):
+                return self._io.getbuffer().nbytes - self._io_start
+            end = self._io.seek(0, 2)
+            return end - self._io_start
+        return len(self.inline_data)
+
+    @contextmanager
+    def open_buffer(self) -> Iterator[Buffer]:
+        """以只读缓冲区形式访问媒体内容；文件使用 mmap，BytesIO 直接共享其内存
+
+        Raises:
+            UnsupportedOperation: ``data_io`` 既不是 BytesIO 也无法 mmap (见 ``buffered``)
+        """
+        if self._path is not None:
+            with self._path.open("rb") as f:
+                if self._path.stat().st_size == 0:
+                    yield b""
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        yield view
+        elif isinstance(self._io, BytesIO):
+            with self._io.getbuffer() as view:
+                with view[self._io_start:] as part:
+                    yield part
+        elif self._io is not None:
+            fileno = self._io_fileno()
+            if fileno is None:
+                raise UnsupportedOperation("该 data_io 无法映射为缓冲区，请使用 iter_chunks() 按块读取")
+            if os.fstat(fileno).st_size <= self._io_start:
+                yield b""
+                return
+            with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    with view[self._io_start :] as part:
+                        yield part
+        else:
+            yield self.inline_data
+
+    def iter_chunks(self, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+        """按块迭代媒体内容，峰值内存不超过 chunk_size"""
+        if not self.buffered:
+            assert self._io is not None
+            self._io.seek(self._io_start)
+            while chunk := self._io.read(chunk_size):
+                yield chunk
+            return
+        with self.open_buffer() as buf:
+            for offset in range(0, len(buf), chunk_size):
+                yield bytes(buf[offset : offset + chunk_size])
+
+    def read_bytes(self) -> bytes:
+        """读取完整的媒体内容"""
+        if not self.lazy:
+            return self.inline_data
+        if not self.buffered:
+            return b"".join(self.iter_chunks())
+        with self.open_buffer() as buf:
+            return bytes(buf)
+
+    def head(self, size: int) -> bytes:
+        """媒体内容的前 size 个字节"""
+        with closing(self.iter_chunks(size)) as chunks:
+            return next(chunks, b"")
+
+    def sha256(self) -> str:
+        """媒体内容的 sha256 (十六进制)，计算结果会被缓存"""
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            if self.buffered:
+                with self.open_buffer() as buf:
+                    digest.update(buf)
+            else:
+                for chunk in self.iter_chunks():
+                    digest.update(chunk)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
 
 
 class Image(MediaElement):
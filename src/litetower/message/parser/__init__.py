@@ -2,6 +2,8 @@ from litetower.message.parser.base import (
     MatchResult as MatchResult,
     DetectPrefix as DetectPrefix,
     DetectSuffix as DetectSuffix,
+    DetectRegex as DetectRegex,
     ContainKeyword as ContainKeyword,
     QCommandMatcher as QCommandMatcher,
+    MatcherChain as MatcherChain,
 )
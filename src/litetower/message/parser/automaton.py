@@ -0,0 +1,115 @@
+"""Aho–Corasick 多模式匹配自动机。
+
+所有 ``ContainKeyword`` 的关键字编译进同一个自动机，一次扫描即可找出内容中
+出现的全部关键字及其位置，开销与关键字数量无关。
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, Tuple
+
+
+class AhoCorasick:
+    """可增量添加关键字的 Aho–Corasick 自动机
+
+    添加关键字只更新字典树，失配指针与输出表在下次扫描前统一重建。
+    关键字按引用计数，最后一次 ``remove`` 时才移除 (此时整棵字典树重建)。
+    """
+
+    __slots__ = ("_goto", "_fail", "_out", "_keywords", "_refs", "_dirty", "version")
+
+    def __init__(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        self._keywords: Dict[str, int] = {}
+        """关键字 -> 终止状态"""
+        self._refs: Dict[str, int] = {}
+        """关键字 -> 注册次数"""
+        self._dirty = False
+        self.version = 0
+        """每次加入或移除关键字时递增"""
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._keywords
+
+    def add(self, keyword: str) -> None:
+        if not keyword:
+            raise ValueError("关键字不能为空")
+        refs = self._refs.get(keyword, 0)
+        self._refs[keyword] = refs + 1
+        if refs:
+            return
+        self._insert(keyword)
+        self._dirty = True
+        self.version += 1
+
+    def remove(self, keyword: str) -> None:
+        """注销一次；最后一次注销时移除该关键字"""
+        refs = self._refs.get(keyword, 0)
+        if refs > 1:
+            self._refs[keyword] = refs - 1
+            return
+        if not refs:
+            return
+        del self._refs[keyword]
+        self._goto = [{}]
+        self._keywords = {}
+        for remaining in self._refs:
+            self._insert(remaining)
+        self._dirty = True
+        self.version += 1
+
+    def _insert(self, keyword: str) -> None:
+        goto = self._goto
+        state = 0
+        for ch in keyword:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][ch] = nxt
+                goto.append({})
+            state = nxt
+        self._keywords[keyword] = state
+
+    def _build(self) -> None:
+        goto = self._goto
+        fail = [0] * len(goto)
+        own: List[Tuple[str, ...]] = [()] * len(goto)
+        for keyword, state in self._keywords.items():
+            own[state] = (keyword,)
+        out = list(own)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                # 失配链上的输出合并到本状态，扫描时无需再沿链回溯
+                out[nxt] = own[nxt] + out[fail[nxt]]
+        self._fail = fail
+        self._out = out
+        self._dirty = False
+
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """扫描内容，返回 关键字 -> 出现的起始位置列表 (按出现顺序)"""
+        if self._dirty:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: Dict[str, List[int]] = {}
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for keyword in out[state]:
+                    hits.setdefault(keyword, []).append(i - len(keyword) + 1)
+        return hits
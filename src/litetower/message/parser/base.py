@@ -1,8 +1,13 @@
-"""消息内容前缀/后缀/关键字检测器。
+"""消息内容前缀/后缀/关键字/正则检测器。
 
 基于 Letoderea Propagator (前置传播) + Propagator.providers 实现：
 - 匹配成功时将结果以 ``text: str`` (按名注入) 和 ``MatchResult`` (按类型注入) 两种方式提供
 - 不匹配时 raise STOP 中止当前订阅者
+- ``DetectPrefix`` / ``QCommandMatcher`` 的前缀注册到全局字典树 (见 ``router``)，
+  每条消息只查找一次，各订阅者只做集合查找
+- ``ContainKeyword`` 的关键字与 ``DetectRegex`` 的模式同样全局合并，每条消息只扫描一次
+- 构造匹配器没有全局副作用；经 Beacon 加载时由 ``register()`` / ``unregister()`` 随监听器注册与注销，
+  未注册的匹配器直接匹配消息内容
 
 用法 (按名注入)::
 
@@ -21,8 +26,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Generator, List, Union
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generator, List, Optional, Sequence, Union
 
 from arclet.letoderea import (
     Propagator,
@@ -30,7 +36,17 @@ from arclet.letoderea import (
     STOP,
     provide,
 )
-from litetower.models.content import Content
+from litetower.message.parser.router import (
+    Routing,
+    command_match,
+    register,
+    register_keyword,
+    register_regex,
+    route,
+    unregister,
+    unregister_keyword,
+    unregister_regex,
+)
 
 
 # ───────────────── 匹配结果类型 ─────────────────
@@ -45,23 +61,30 @@ class MatchResult:
 
     Attributes:
         text: 去除匹配部分后的内容
+        keywords: 命中的关键字 (按首次出现顺序，仅 ContainKeyword)
+        positions: 关键字 -> 出现的起始位置列表 (仅 ContainKeyword)
+        groups: 命名分组 (仅 DetectRegex)
+        match: 正则匹配对象 (仅 DetectRegex)
     """
 
     text: str
+    keywords: List[str] = field(default_factory=list)
+    positions: Dict[str, List[int]] = field(default_factory=dict)
+    groups: Dict[str, Any] = field(default_factory=dict)
+    match: Optional[re.Match[str]] = None
 
 
-# ───────────────── 辅助函数 ─────────────────
-
-
-def _get_text(event: Any) -> tuple[Any, str]:
-    """从事件中提取原始 content 及其 str 形式。"""
-    raw = getattr(event, "content", None)
-    return raw, (str(raw) if raw is not None else "")
-
-
-def _wrap(raw: Any, text: str) -> str:
-    """保持与原始 content 相同的类型。"""
-    return Content(text) if isinstance(raw, Content) else text
+def _find_keywords(text: str, keywords: Sequence[str]) -> Dict[str, List[int]]:
+    """逐个查找关键字的全部出现位置 (与自动机扫描结果一致)，供未注册的匹配器使用"""
+    hits: Dict[str, List[int]] = {}
+    for k in keywords:
+        if not k:
+            continue
+        at = text.find(k)
+        while at != -1:
+            hits.setdefault(k, []).append(at)
+            at = text.find(k, at + 1)
+    return hits
 
 
 # ───────────────── 基类 ─────────────────
@@ -81,15 +104,32 @@ class _ContentMatcher(Propagator):
         """
         raise NotImplementedError
 
+    def register(self) -> None:
+        """将前缀 / 关键字 / 模式注册到全局路由 (可重复调用)。
+
+        经 Beacon 加载的匹配器在其第一个监听器分配时自动调用；未注册时退回 ``_check``。
+        """
+
+    def unregister(self) -> None:
+        """注销 ``register`` 注册的前缀 / 关键字 / 模式 (可重复调用)。
+
+        经 Beacon 加载的匹配器在其最后一个监听器被释放时自动调用。
+        """
+
+    def _match(self, routing: Routing) -> Optional[MatchResult]:
+        """基于事件路由结果匹配，默认退回 ``_check``。"""
+        matched, stripped = self._check(routing.text)
+        return MatchResult(text=stripped) if matched else None
+
     # -- Propagator --
 
     def compose(self) -> Generator:
         def _prepend(event: Any) -> dict[str, Any]:
-            raw, text = _get_text(event)
-            matched, stripped = self._check(text)
-            if not matched:
+            routing = route(event)
+            result = self._match(routing)
+            if result is None:
                 raise STOP
-            result = MatchResult(text=_wrap(raw, stripped))
+            result.text = routing.wrap(result.text)
             return {_MATCH_RESULT_KEY: result, "text": result.text}
 
         yield _prepend, True
@@ -114,6 +154,18 @@ class DetectPrefix(_ContentMatcher):
 
     def __init__(self, prefix: Union[str, List[str]]):
         self.prefixes = [prefix] if isinstance(prefix, str) else prefix
+        self._registered: List[str] = []
+
+    def register(self) -> None:
+        if not self._registered:
+            self._registered = list(self.prefixes)
+            for p in self._registered:
+                register(p)
+
+    def unregister(self) -> None:
+        for p in self._registered:
+            unregister(p)
+        self._registered = []
 
     def _check(self, text: str) -> tuple[bool, str]:
         for p in self.prefixes:
@@ -121,6 +173,15 @@ class DetectPrefix(_ContentMatcher):
                 return True, text[len(p) :].lstrip()
         return False, ""
 
+    def _match(self, routing: Routing) -> Optional[MatchResult]:
+        if not self._registered:
+            return super()._match(routing)
+        matched = routing.prefixes
+        for p in self.prefixes:
+            if p in matched:
+                return MatchResult(text=routing.text[len(p) :].lstrip())
+        return None
+
 
 class DetectSuffix(_ContentMatcher):
     """后缀检测器。
@@ -139,19 +200,99 @@ class DetectSuffix(_ContentMatcher):
 
 
 class ContainKeyword(_ContentMatcher):
-    """关键字包含检测器。
+    """关键字包含检测器，包含任一关键字即匹配。
+
+    匹配成功后注入 ``text`` — 原始内容 (未去除关键字)；
+    ``MatchResult.keywords`` / ``MatchResult.positions`` 为命中的关键字及其位置。
+    所有关键字编译进同一个自动机，每条消息只扫描一次。
+
+    ``ignore_case=True`` 时在内容的 casefold 形式上匹配，``keywords`` 与
+    ``positions`` 也基于 casefold 后的关键字与内容。
+    """
+
+    def __init__(self, keyword: Union[str, List[str]], ignore_case: bool = False):
+        self.keywords = [keyword] if isinstance(keyword, str) else list(keyword)
+        self.ignore_case = ignore_case
+        if ignore_case:
+            self.keywords = list(dict.fromkeys(k.casefold() for k in self.keywords))
+        self._registered: List[str] = []
+
+    def register(self) -> None:
+        if not self._registered:
+            self._registered = list(self.keywords)
+            for k in self._registered:
+                register_keyword(k)
+
+    def unregister(self) -> None:
+        for k in self._registered:
+            unregister_keyword(k)
+        self._registered = []
+
+    @property
+    def keyword(self) -> str:
+        """首个关键字"""
+        return self.keywords[0]
 
-    匹配成功后注入 ``text`` — 原始内容 (未去除关键字)。
+    def _check(self, text: str) -> tuple[bool, str]:
+        haystack = text.casefold() if self.ignore_case else text
+        if any(k in haystack for k in self.keywords):
+            return True, text
+        return False, ""
+
+    def _match(self, routing: Routing) -> Optional[MatchResult]:
+        if not self._registered:
+            hits = _find_keywords(
+                routing.casefolded if self.ignore_case else routing.text, self.keywords
+            )
+        else:
+            hits = routing.folded_keyword_hits if self.ignore_case else routing.keyword_hits
+        found = [k for k in self.keywords if k in hits]
+        if not found:
+            return None
+        found.sort(key=lambda k: hits[k][0])
+        return MatchResult(
+            text=routing.text,
+            keywords=found,
+            positions={k: list(hits[k]) for k in found},
+        )
+
+
+class DetectRegex(_ContentMatcher):
+    """正则检测器 (``re.search`` 语义，需要锚定时在模式中使用 ``^`` / ``$``)。
+
+    匹配成功后注入 ``text`` — 原始内容；``MatchResult.groups`` 为命名分组。
+    所有模式合并为一个预筛模式，不匹配任何模式的消息只需扫描一次。
     """
 
-    def __init__(self, keyword: str):
-        self.keyword = keyword
+    def __init__(self, pattern: Union[str, re.Pattern[str]], flags: int = 0):
+        self.pattern = re.compile(pattern, flags)
+        self._pid = -1
+        self._registered = False
+
+    def register(self) -> None:
+        if not self._registered:
+            self._pid = register_regex(self.pattern)
+            self._registered = True
+
+    def unregister(self) -> None:
+        if self._registered:
+            unregister_regex(self._pid)
+            self._registered = False
 
     def _check(self, text: str) -> tuple[bool, str]:
-        if self.keyword in text:
+        if self.pattern.search(text):
             return True, text
         return False, ""
 
+    def _match(self, routing: Routing) -> Optional[MatchResult]:
+        if self._registered:
+            match = routing.regex(self._pid)
+        else:
+            match = self.pattern.search(routing.text)
+        if match is None:
+            return None
+        return MatchResult(text=routing.text, groups=match.groupdict(), match=match)
+
 
 class QCommandMatcher(_ContentMatcher):
     """QQ 指令匹配器 (``/cmd`` 格式)。
@@ -161,6 +302,18 @@ class QCommandMatcher(_ContentMatcher):
 
     def __init__(self, command: str):
         self.command = command
+        self._cmd = f"/{command}"
+        self._registered = False
+
+    def register(self) -> None:
+        if not self._registered:
+            register(self._cmd)
+            self._registered = True
+
+    def unregister(self) -> None:
+        if self._registered:
+            unregister(self._cmd)
+            self._registered = False
 
     def _check(self, text: str) -> tuple[bool, str]:
         text = text.strip()
@@ -171,3 +324,68 @@ class QCommandMatcher(_ContentMatcher):
             return True, text[len(cmd) + 1 :].strip()
         return False, ""
 
+    def _match(self, routing: Routing) -> Optional[MatchResult]:
+        if not self._registered:
+            return super()._match(routing)
+        rest = command_match(routing, self._cmd)
+        return None if rest is None else MatchResult(text=rest)
+
+
+
+# ───────────────── 匹配器合并 ─────────────────
+
+
+class MatcherChain(_ContentMatcher):
+    """依次匹配多个内容匹配器，作为单个前置传播步骤执行。
+
+    所有匹配器都匹配时才算匹配，注入最后一个匹配器的结果 (与逐个挂载时
+    后者覆盖前者的行为一致)；省去逐级调用与结果字典合并的开销。
+    """
+
+    def __init__(self, *matchers: _ContentMatcher):
+        self.matchers: List[_ContentMatcher] = []
+        for m in matchers:
+            self.matchers.extend(m.matchers if isinstance(m, MatcherChain) else [m])
+
+    def _check(self, text: str) -> tuple[bool, str]:
+        stripped = text
+        for m in self.matchers:
+            matched, stripped = m._check(text)
+            if not matched:
+                return False, ""
+        return True, stripped
+
+    def _match(self, routing: Routing) -> Optional[MatchResult]:
+        result: Optional[MatchResult] = None
+        for m in self.matchers:
+            result = m._match(routing)
+            if result is None:
+                return None
+        return result
+
+
+def fuse_matchers(propagators: Sequence[Propagator]) -> List[Propagator]:
+    """将相邻的内容匹配器合并为 ``MatcherChain``，其余传播器保持原有顺序。"""
+    fused: List[Propagator] = []
+    run: List[_ContentMatcher] = []
+
+    def flush() -> None:
+        if len(run) > 1:
+            fused.append(MatcherChain(*run))
+        else:
+            fused.extend(run)
+        run.clear()
+
+    for p in propagators:
+        # 子类可能扩展了 compose / providers，仅合并未覆写这两者的匹配器
+        if (
+            isinstance(p, _ContentMatcher)
+            and type(p).compose is _ContentMatcher.compose
+            and type(p).providers is _ContentMatcher.providers
+        ):
+            run.append(p)
+        else:
+            flush()
+            fused.append(p)
+    flush()
+    return fused
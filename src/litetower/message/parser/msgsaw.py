@@ -1,18 +1,40 @@
 """MessageSaw — 指令与子指令解析器。
 
 重写为 Letoderea Provider 模式，将 QSubResult 注入到 Contexts 中。
+指令前缀注册到全局字典树 (见 ``router``)，未命中的消息不进入解析。
+
+构造时将指令编译为固定的语法：
+- 子指令按最长匹配分派 (``listall`` 不会被 ``list`` 抢先匹配)，候选长度预先排序
+- 可声明带类型的参数：``int`` / ``openid`` / ``str`` (支持引号) / ``rest`` (剩余全部内容)
+- 同一事件的词元切分与解析结果缓存在事件路由上，相同配置的 MessageSaw 直接复用
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from bisect import bisect_right
+from dataclasses import dataclass, field, replace
+from operator import itemgetter
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
 
 import arclet.letoderea as leto
 from arclet.letoderea import ProviderFactory
 
+from litetower.message.parser.router import register, route, tokenize, unregister
+
+ArgType = Literal["int", "openid", "str", "rest"]
+"""参数类型"""
+
+ArgSpec = Sequence[Tuple[str, ArgType]]
+"""参数声明：(参数名, 类型) 列表"""
 
+SubCommand = Union[Tuple[str, bool], Tuple[str, bool, ArgSpec]]
+"""子指令声明：(子指令, required) 或 (子指令, required, 参数声明)"""
+
+_INT = re.compile(r"[+-]?\d+")
+_OPENID = re.compile(r"[0-9A-Fa-f]{32}")
+_QUOTES = "\"'"
+_END_OF = itemgetter(1)
 
 
 @dataclass
@@ -27,6 +49,26 @@ class QSubResult:
     """参数列表"""
     text: str = ""
     """剩余内容"""
+    values: Dict[str, Any] = field(default_factory=dict)
+    """按参数声明解析出的带类型参数"""
+
+
+def _unquote(text: str, start: int) -> Optional[Tuple[str, int]]:
+    """解析从 ``start`` 处引号开始的字符串，返回 (内容, 右引号之后的位置)"""
+    quote = text[start]
+    chars: List[str] = []
+    i = start + 1
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            chars.append(text[i + 1])
+            i += 2
+            continue
+        if ch == quote:
+            return "".join(chars), i + 1
+        chars.append(ch)
+        i += 1
+    return None
 
 
 class MessageSaw(ProviderFactory):
@@ -38,55 +80,145 @@ class MessageSaw(ProviderFactory):
         @leto.on(GroupMessage, providers=[saw])
         async def handler(result: QSubResult):
             ...
+
+    带类型参数::
+
+        saw = MessageSaw("/ban", args=[("user", "openid"), ("minutes", "int")])
+        # "/ban 0123...ABCD 10" -> result.values == {"user": "0123...ABCD", "minutes": 10}
+
+    参数不足或类型不符时视为不匹配；多余的词元仍保留在 ``args`` 中。
     """
 
     def __init__(
         self,
         command: str,
-        sub_commands: Optional[List[Tuple[str, bool]]] = None,
+        sub_commands: Optional[List[SubCommand]] = None,
+        args: Optional[ArgSpec] = None,
     ):
         self.command = command
         self.sub_commands = sub_commands or []
+        self.args = list(args or [])
+        for spec in [self.args, *(sub[2] for sub in self.sub_commands if len(sub) > 2)]:
+            self._validate_spec(spec)
+
+        # 子指令 -> 参数声明；候选长度从长到短，实现最长匹配
+        self._subs: Dict[str, List[Tuple[str, ArgType]]] = {}
+        for sub in self.sub_commands:
+            self._subs.setdefault(sub[0], list(sub[2]) if len(sub) > 2 else [])
+        self._sub_lengths = sorted({len(name) for name in self._subs}, reverse=True)
+        self._key = (
+            command,
+            tuple((name, tuple(spec)) for name, spec in self._subs.items()),
+            tuple(self.args),
+        )
+        self._registered = False
+
+    def register(self) -> None:
+        """注册指令前缀 (可重复调用)，经 Beacon 加载时随监听器分配自动调用；未注册时逐条解析内容"""
+        if not self._registered:
+            register(self.command)
+            self._registered = True
+
+    def unregister(self) -> None:
+        """注销指令前缀 (可重复调用)，经 Beacon 加载时随监听器释放自动调用"""
+        if self._registered:
+            unregister(self.command)
+            self._registered = False
+
+    @staticmethod
+    def _validate_spec(spec: ArgSpec) -> None:
+        for i, (name, kind) in enumerate(spec):
+            if kind not in ("int", "openid", "str", "rest"):
+                raise ValueError(f"未知的参数类型: {kind!r} ({name})")
+            if kind == "rest" and i != len(spec) - 1:
+                raise ValueError(f"rest 参数必须位于最后: {name}")
 
     def parse(self, content: str) -> Optional[QSubResult]:
         """解析消息内容"""
         text = content.strip()
+        return self._parse(text, tokenize(text))
 
+    def _parse(self, text: str, spans: List[Tuple[int, int]]) -> Optional[QSubResult]:
         # 检查指令匹配
         if not text.startswith(self.command):
             return None
+        pos = len(self.command)
+
+        # 最长匹配子指令
+        sub_command: Optional[str] = None
+        spec = self.args
+        if self._subs:
+            start = self._skip(text, spans, pos)
+            for length in self._sub_lengths:
+                name = text[start : start + length]
+                if name in self._subs:
+                    sub_command = name
+                    spec = self._subs[name]
+                    pos = start + length
+                    break
+
+        # 剩余词元 (首个词元可能被指令/子指令截断)
+        first = bisect_right(spans, pos, key=_END_OF)
+        tokens = [(max(s, pos), e) for s, e in spans[first:]]
+
+        values: Dict[str, Any] = {}
+        if spec:
+            parsed = self._parse_args(text, tokens, spec)
+            if parsed is None:
+                return None
+            values = parsed
 
-        remaining = text[len(self.command):].strip()
-
-        # 无子指令
-        if not self.sub_commands:
-            parts = remaining.split() if remaining else []
-            return QSubResult(
-                command=self.command,
-                args=parts,
-                text=remaining,
-            )
-
-        # 匹配子指令
-        for sub_cmd, required in self.sub_commands:
-            if remaining.startswith(sub_cmd):
-                sub_remaining = remaining[len(sub_cmd):].strip()
-                parts = sub_remaining.split() if sub_remaining else []
-                return QSubResult(
-                    command=self.command,
-                    sub_command=sub_cmd,
-                    args=parts,
-                    text=sub_remaining,
-                )
-
-        # 没有匹配到子指令
-        parts = remaining.split() if remaining else []
         return QSubResult(
             command=self.command,
-            args=parts,
-            text=remaining,
+            sub_command=sub_command,
+            args=[text[s:e] for s, e in tokens],
+            text=text[tokens[0][0] :] if tokens else "",
+            values=values,
         )
 
+    @staticmethod
+    def _skip(text: str, spans: List[Tuple[int, int]], pos: int) -> int:
+        """``pos`` 之后第一个非空白字符的位置"""
+        i = bisect_right(spans, pos, key=_END_OF)
+        if i == len(spans):
+            return len(text)
+        return max(spans[i][0], pos)
+
+    @staticmethod
+    def _parse_args(
+        text: str, tokens: List[Tuple[int, int]], spec: Sequence[Tuple[str, ArgType]]
+    ) -> Optional[Dict[str, Any]]:
+        values: Dict[str, Any] = {}
+        i = 0
+        for name, kind in spec:
+            if kind == "rest":
+                values[name] = text[tokens[i][0] :] if i < len(tokens) else ""
+                return values
+            if i >= len(tokens):
+                return None
+            start, end = tokens[i]
+            token = text[start:end]
+            if kind == "int":
+                if not _INT.fullmatch(token):
+                    return None
+                values[name] = int(token)
+            elif kind == "openid":
+                if not _OPENID.fullmatch(token):
+                    return None
+                values[name] = token
+            elif token[0] in _QUOTES:
+                quoted = _unquote(text, start)
+                if quoted is None:
+                    return None
+                values[name], close = quoted
+                # 跳过引号内的词元
+                while i + 1 < len(tokens) and tokens[i + 1][0] < close:
+                    i += 1
+            else:
+                values[name] = token
+            i += 1
+        return values
+
     def validate(self, param: leto.Param) -> "leto.Provider[QSubResult] | None":
         """作为 ProviderFactory 使用"""
         if param.annotation is QSubResult or param.name == "result":
@@ -109,6 +241,19 @@ class _MessageSawProvider(leto.Provider[QSubResult]):  # type: ignore[type-arg]
         if event is None:
             return None
         content = getattr(event, "content", None)
+        if isinstance(content, str) and self.saw._registered:
+            routing = route(event)
+            if self.saw.command not in routing.commands:
+                raise leto.STOP
+            # 相同配置的 MessageSaw 共享同一事件的解析结果
+            key = (MessageSaw, self.saw._key)
+            if key in routing.memo:
+                result = routing.memo[key]
+            else:
+                result = routing.memo[key] = self.saw._parse(routing.stripped, routing.tokens)
+            if result is None:
+                raise leto.STOP
+            return replace(result, args=list(result.args), values=dict(result.values))
         if content is None:
             content = context.get("content")
         if content is None:
@@ -117,7 +262,7 @@ class _MessageSawProvider(leto.Provider[QSubResult]):  # type: ignore[type-arg]
         if not isinstance(content, str):
             # Fallback if somehow it's not string (shouldn't happen with new event defs)
              return None
-             
+
         result = self.saw.parse(content)
         if result is None:
             raise leto.STOP
@@ -0,0 +1,159 @@
+"""正则模式索引。
+
+所有 ``DetectRegex`` 的模式只编译一次，并合并为一个交替模式作为预筛：
+合并模式在消息中找不到任何匹配时，所有参与合并的模式都可以直接判定为不匹配，
+一次扫描即可拒绝整条消息。
+
+合并前命名分组改写为非捕获分组以避免重名；含反向引用、条件分组或无法以
+局部标志表达的模式不参与合并，始终单独匹配。
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+_SCOPED_FLAGS = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+_FUSIBLE_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE | re.UNICODE
+_LEADING_FLAGS = re.compile(r"^\(\?[aiLmsux]+\)")
+
+
+def _fusible_body(pattern: Pattern[str]) -> Optional[str]:
+    """改写为可放入交替模式的分支；无法安全合并时返回 None"""
+    if pattern.flags & ~_FUSIBLE_FLAGS:
+        return None
+    # 开头的全局内联标志已反映在 pattern.flags 中，改由局部标志表达
+    source = _LEADING_FLAGS.sub("", pattern.pattern, count=1)
+    out: List[str] = []
+    i, n = 0, len(source)
+    in_class = False
+    while i < n:
+        ch = source[i]
+        if ch == "\\":
+            nxt = source[i + 1 : i + 2]
+            if nxt.isdigit() and nxt != "0" and not in_class:
+                # 编号反向引用
+                return None
+            out.append(source[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            if ch == "]":
+                in_class = False
+        elif ch == "[":
+            in_class = True
+            out.append(ch)
+            i += 1
+            # 紧随其后的 ``^`` 与 ``]`` 属于字符类本身
+            if source[i : i + 1] == "^":
+                out.append("^")
+                i += 1
+            if source[i : i + 1] == "]":
+                out.append("]")
+                i += 1
+            continue
+        elif source.startswith("(?P<", i):
+            end = source.find(">", i)
+            if end < 0:
+                return None
+            out.append("(?:")
+            i = end + 1
+            continue
+        elif source.startswith("(?P=", i) or source.startswith("(?(", i):
+            return None
+        out.append(ch)
+        i += 1
+    letters = "".join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+    body = "".join(out)
+    if pattern.flags & re.VERBOSE:
+        # 避免末尾的 ``#`` 注释吞掉分支的右括号
+        body += "\n"
+    branch = f"(?{letters}:{body})" if letters else f"(?:{body})"
+    try:
+        # 模式中间的全局内联标志 (如 ``(?i)``) 无法放入分支
+        re.compile(f"(?:)|{branch}")
+    except re.error:
+        return None
+    return branch
+
+
+class RegexIndex:
+    """共享编译结果的正则模式索引"""
+
+    __slots__ = ("patterns", "_ids", "_refs", "_fused", "_fusible", "_dirty", "version")
+
+    def __init__(self) -> None:
+        self.patterns: List[Optional[Pattern[str]]] = []
+        """已注册的模式，下标即模式 id；已移除的模式为 None (id 不复用)"""
+        self._ids: Dict[Tuple[str, int], int] = {}
+        self._refs: List[int] = []
+        self._fused: Optional[Pattern[str]] = None
+        self._fusible: List[bool] = []
+        self._dirty = False
+        self.version = 0
+        """每次加入或移除模式时递增"""
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, pattern: Pattern[str]) -> int:
+        """注册模式并返回其 id；相同的模式与标志共用一份编译结果 (按引用计数)"""
+        key = (pattern.pattern, pattern.flags)
+        pid = self._ids.get(key)
+        if pid is None:
+            pid = len(self.patterns)
+            self.patterns.append(pattern)
+            self._ids[key] = pid
+            self._refs.append(0)
+            self._fusible.append(False)
+            self._dirty = True
+            self.version += 1
+        self._refs[pid] += 1
+        return pid
+
+    def remove(self, pid: int) -> None:
+        """注销一次；最后一次注销时移除该模式"""
+        pattern = self.patterns[pid]
+        if pattern is None:
+            return
+        self._refs[pid] -= 1
+        if self._refs[pid]:
+            return
+        self.patterns[pid] = None
+        del self._ids[(pattern.pattern, pattern.flags)]
+        self._fusible[pid] = False
+        self._dirty = True
+        self.version += 1
+
+    def _build(self) -> None:
+        branches = []
+        for pid, pattern in enumerate(self.patterns):
+            if pattern is None:
+                continue
+            branch = _fusible_body(pattern)
+            self._fusible[pid] = branch is not None
+            if branch is not None:
+                branches.append(branch)
+        self._fused = re.compile("|".join(branches)) if branches else None
+        self._dirty = False
+
+    def fused(self, pid: int) -> bool:
+        """模式是否参与合并预筛"""
+        if self._dirty:
+            self._build()
+        return self._fusible[pid]
+
+    def prefilter(self, text: str) -> bool:
+        """是否可能有参与合并的模式匹配；为 False 时这些模式都不匹配"""
+        if self._dirty:
+            self._build()
+        return self._fused is not None and self._fused.search(text) is not None
+
+    def search(self, pid: int, text: str) -> Optional[re.Match[str]]:
+        pattern = self.patterns[pid]
+        return pattern.search(text) if pattern is not None else None
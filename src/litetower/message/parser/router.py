@@ -0,0 +1,315 @@
+"""指令前缀与关键字路由，以及按事件共享的匹配上下文。
+
+``DetectPrefix``、``QCommandMatcher`` 与 ``MessageSaw`` 在构造时把各自的前缀注册到
+全局字典树。每条消息在首次被匹配时沿字典树走一遍，得到命中的全部前缀并按事件缓存；
+此后每个订阅者的匹配只是一次集合查找，总开销随消息长度而非已注册指令的数量增长。
+
+``ContainKeyword`` 的关键字同理注册到全局 Aho–Corasick 自动机，``DetectRegex`` 的模式
+注册到全局正则索引，每条消息各只扫描一次。
+
+注册按引用计数，匹配器所在的插件被卸载时注销 (见 ``unregister``)，最后一个使用者注销后才移除。
+
+``Routing`` 是同一事件所有匹配器共享的上下文：str 形式、strip、casefold、词元切分与
+``Content`` 包装都只在首次使用时计算一次。
+"""
+
+from __future__ import annotations
+
+import re
+import weakref
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+from litetower.message.parser.automaton import AhoCorasick
+from litetower.message.parser.regexindex import RegexIndex
+from litetower.models.content import Content
+
+_END = ""
+"""节点中标记完整前缀的键 (单个字符不可能为空串)"""
+
+_TOKEN = re.compile(r"\S+")
+
+
+def tokenize(text: str) -> List[Tuple[int, int]]:
+    """按空白切分，返回各词元的 (起始, 结束) 位置"""
+    return [m.span() for m in _TOKEN.finditer(text)]
+
+
+class PrefixTrie:
+    """字符级前缀字典树"""
+
+    __slots__ = ("_root", "_refs", "version")
+
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+        self._refs: Dict[str, int] = {}
+        """前缀 -> 注册次数"""
+        self.version = 0
+        """每次加入或移除前缀时递增，用于判断按事件缓存的路由结果是否过期"""
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def __contains__(self, prefix: str) -> bool:
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return False
+        return _END in node
+
+    def add(self, prefix: str) -> None:
+        refs = self._refs.get(prefix, 0)
+        self._refs[prefix] = refs + 1
+        if refs:
+            return
+        node = self._root
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node[_END] = prefix
+        self.version += 1
+
+    def remove(self, prefix: str) -> None:
+        """注销一次；最后一次注销时从字典树中移除并清理空节点"""
+        refs = self._refs.get(prefix, 0)
+        if refs > 1:
+            self._refs[prefix] = refs - 1
+            return
+        if not refs:
+            return
+        del self._refs[prefix]
+        path = [self._root]
+        for ch in prefix:
+            path.append(path[-1][ch])
+        del path[-1][_END]
+        for i in range(len(prefix), 0, -1):
+            if path[i]:
+                break
+            del path[i - 1][prefix[i - 1]]
+        self.version += 1
+
+    def walk(self, text: str) -> FrozenSet[str]:
+        """返回 ``text`` 以之开头的全部已注册前缀"""
+        node = self._root
+        found: List[str] = []
+        if _END in node:
+            found.append(node[_END])
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            if _END in node:
+                found.append(node[_END])
+        return frozenset(found)
+
+
+class Routing:
+    """单条消息的共享匹配上下文
+
+    同一事件的所有匹配器共享一个实例；内容的各种规范化形式与路由结果都在
+    首次访问时计算并缓存。
+    """
+
+    __slots__ = (
+        "raw",
+        "text",
+        "memo",
+        "_stripped",
+        "_casefolded",
+        "_tokens",
+        "_wrapped",
+        "_prefixes",
+        "_commands",
+        "_prefix_version",
+        "_keyword_hits",
+        "_keyword_version",
+        "_folded_hits",
+        "_folded_version",
+        "_regex_matches",
+        "_regex_possible",
+        "_regex_version",
+        "__weakref__",
+    )
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        """事件的原始 content"""
+        self.text: str = str(raw) if raw is not None else ""
+        """消息内容的 str 形式"""
+        self.memo: Dict[Any, Any] = {}
+        """匹配器以自身键缓存的解析结果，供相同配置的匹配器复用"""
+        self._stripped: Optional[str] = None
+        self._casefolded: Optional[str] = None
+        self._tokens: Optional[List[Tuple[int, int]]] = None
+        self._wrapped: Dict[str, str] = {}
+        self._prefixes: FrozenSet[str] = frozenset()
+        self._commands: FrozenSet[str] = frozenset()
+        self._prefix_version = -1
+        self._keyword_hits: Dict[str, List[int]] = {}
+        self._keyword_version = -1
+        self._folded_hits: Dict[str, List[int]] = {}
+        self._folded_version = -1
+        self._regex_matches: Dict[int, Optional[re.Match[str]]] = {}
+        self._regex_possible: Optional[bool] = None
+        self._regex_version = -1
+
+    # ===== 规范化形式 =====
+
+    @property
+    def stripped(self) -> str:
+        """去除首尾空白后的内容"""
+        if self._stripped is None:
+            self._stripped = self.text.strip()
+        return self._stripped
+
+    @property
+    def casefolded(self) -> str:
+        """``text`` 的 casefold 形式，用于忽略大小写的匹配"""
+        if self._casefolded is None:
+            self._casefolded = self.text.casefold()
+        return self._casefolded
+
+    @property
+    def tokens(self) -> List[Tuple[int, int]]:
+        """``stripped`` 的词元位置，首次访问时切分"""
+        if self._tokens is None:
+            self._tokens = tokenize(self.stripped)
+        return self._tokens
+
+    def wrap(self, text: str) -> str:
+        """保持与原始 content 相同的类型；相同内容只构造一次"""
+        if not isinstance(self.raw, Content):
+            return text
+        if text == self.text:
+            return self.raw
+        wrapped = self._wrapped.get(text)
+        if wrapped is None:
+            wrapped = self._wrapped[text] = Content(text)
+        return wrapped
+
+    # ===== 路由结果 =====
+
+    def _walk(self) -> None:
+        if self._prefix_version != router.version:
+            self._prefixes = router.walk(self.text)
+            self._commands = (
+                self._prefixes if self.stripped == self.text else router.walk(self.stripped)
+            )
+            self._prefix_version = router.version
+
+    @property
+    def prefixes(self) -> FrozenSet[str]:
+        """``text`` 命中的前缀"""
+        self._walk()
+        return self._prefixes
+
+    @property
+    def commands(self) -> FrozenSet[str]:
+        """``stripped`` 命中的前缀"""
+        self._walk()
+        return self._commands
+
+    @property
+    def keyword_hits(self) -> Dict[str, List[int]]:
+        """``text`` 中出现的已注册关键字 -> 起始位置列表，首次访问时扫描"""
+        if self._keyword_version != keywords.version:
+            self._keyword_hits = keywords.scan(self.text)
+            self._keyword_version = keywords.version
+        return self._keyword_hits
+
+    @property
+    def folded_keyword_hits(self) -> Dict[str, List[int]]:
+        """``casefolded`` 中出现的已注册关键字 -> 起始位置列表"""
+        if self._folded_version != keywords.version:
+            self._folded_hits = keywords.scan(self.casefolded)
+            self._folded_version = keywords.version
+        return self._folded_hits
+
+    def regex(self, pid: int) -> Optional[re.Match[str]]:
+        """在 ``text`` 中查找已注册的模式，合并预筛未命中时直接返回 None"""
+        if self._regex_version != regexes.version:
+            self._regex_matches = {}
+            self._regex_possible = None
+            self._regex_version = regexes.version
+        if pid in self._regex_matches:
+            return self._regex_matches[pid]
+        if regexes.fused(pid):
+            if self._regex_possible is None:
+                self._regex_possible = regexes.prefilter(self.text)
+            if not self._regex_possible:
+                return None
+        match = self._regex_matches[pid] = regexes.search(pid, self.text)
+        return match
+
+
+router = PrefixTrie()
+"""全局前缀字典树"""
+
+keywords = AhoCorasick()
+"""全局关键字自动机"""
+
+regexes = RegexIndex()
+"""全局正则索引"""
+
+_routings: Dict[int, Routing] = {}
+
+
+def register(prefix: str) -> None:
+    """注册前缀"""
+    router.add(prefix)
+
+
+def register_keyword(keyword: str) -> None:
+    """注册关键字"""
+    keywords.add(keyword)
+
+
+def register_regex(pattern: Pattern[str]) -> int:
+    """注册正则模式，返回模式 id"""
+    return regexes.add(pattern)
+
+
+def unregister(prefix: str) -> None:
+    """注销前缀"""
+    router.remove(prefix)
+
+
+def unregister_keyword(keyword: str) -> None:
+    """注销关键字"""
+    keywords.remove(keyword)
+
+
+def unregister_regex(pid: int) -> None:
+    """注销正则模式"""
+    regexes.remove(pid)
+
+
+def route(event: Any) -> Routing:
+    """取得 (或创建) 事件的共享匹配上下文，同一事件的所有订阅者共享"""
+    raw = getattr(event, "content", None)
+    key = id(event)
+    routing = _routings.get(key)
+    if routing is not None and routing.raw is raw:
+        return routing
+    fresh = routing is None
+    routing = Routing(raw)
+    try:
+        if fresh:
+            # 事件对象被回收时释放缓存
+            weakref.finalize(event, _routings.pop, key, None)
+        _routings[key] = routing
+    except TypeError:
+        # 事件不支持弱引用时不做缓存
+        pass
+    return routing
+
+
+def command_match(routing: Routing, command: str) -> Optional[str]:
+    """``/cmd`` 形式的完整指令匹配：命中时返回指令后的参数内容"""
+    if command not in routing.commands:
+        return None
+    text = routing.stripped
+    if len(text) == len(command):
+        return ""
+    if text[len(command)] == " ":
+        return text[len(command) + 1 :].strip()
+    return None
@@ -31,6 +31,8 @@ class MessageSent(BaseModel):
     timestamp: str
     target_type: str = ""
     target_id: str = ""
+    duplicate: bool = False
+    """重试被平台按 msg_seq 去重：消息已由先前的请求送达，此时 ``id`` 为空"""
 
     async def recall(self, hide_tip: bool = False) -> bool:
         """快速撤回本条消息"""
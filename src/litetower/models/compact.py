@@ -0,0 +1,59 @@
+"""不经过校验构建 pydantic 模型。
+
+紧凑事件 (见 ``litetower.events.compact``) 的作者、群、成员等字段直接由原始 dict 构建为
+对应模型 (``Author`` / ``Group`` / ``Member`` / ``GuildMember`` / ``MessageScene`` ...) 的实例，
+类型与默认路径完全一致，只是跳过 pydantic 校验。
+效果等同于 ``model_construct``，但字段默认值按类缓存，单次构建只做一次 dict 填充。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+M = TypeVar("M", bound=BaseModel)
+
+_FieldDefaults = Tuple[Tuple[str, Any, bool], ...]
+"""(字段名, 默认值或默认工厂, 是否为工厂)"""
+
+_fields: Dict[type, _FieldDefaults] = {}
+_set = object.__setattr__
+
+
+def _field_defaults(cls: Type[BaseModel]) -> _FieldDefaults:
+    defaults = _fields.get(cls)
+    if defaults is None:
+        defaults = _fields[cls] = tuple(
+            (name, info.default_factory, True)
+            if info.default_factory is not None
+            else (name, info.default, False)
+            for name, info in cls.model_fields.items()
+        )
+    return defaults
+
+
+def construct(cls: Type[M], raw: Optional[Mapping[str, Any]] = None, /, **data: Any) -> M:
+    """由原始 dict (及关键字参数覆盖) 构建模型实例，不做校验；缺失的字段取默认值"""
+    if cls.__private_attributes__:
+        # 带私有属性的模型需要 pydantic 初始化私有状态
+        return cls.model_construct(**{**(raw or {}), **data})
+    source = {**raw, **data} if raw and data else (raw or data)
+    values: Dict[str, Any] = {}
+    fields_set = set()
+    for name, default, factory in _field_defaults(cls):
+        if name in source:
+            values[name] = source[name]
+            fields_set.add(name)
+        elif factory:
+            values[name] = default()
+        elif default is not PydanticUndefined:
+            # 与 model_construct 一致：缺失的必填字段不设置
+            values[name] = default
+    obj = cls.__new__(cls)
+    _set(obj, "__dict__", values)
+    _set(obj, "__pydantic_fields_set__", fields_set)
+    _set(obj, "__pydantic_extra__", None)
+    _set(obj, "__pydantic_private__", None)
+    return obj
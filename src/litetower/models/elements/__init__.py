@@ -7,10 +7,15 @@ from litetower.models.elements.guild import (
     GuildMember as GuildMember,
 )
 
-from typing import List, Optional
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Union
 
 from pydantic import BaseModel, RootModel
 
+if TYPE_CHECKING:
+    from litetower.network.download import AttachmentDownloader
+
 
 class Attachment(BaseModel):
     id: Optional[str] = "C2CNOID"
@@ -22,15 +27,31 @@ class Attachment(BaseModel):
     content_type: str
 
     async def to_data_bytes(self, http_client: object | None = None) -> bytes:
-        """将附件转换为字节数据。需要传入 httpx AsyncClient 实例。"""
+        """将附件转换为字节数据。
+
+        Litetower 运行时经由其下载器 (磁盘缓存、共享下载) 获取，
+        否则需要传入 httpx AsyncClient 实例直接下载。
+        """
         from httpx import AsyncClient
 
+        if http_client is not None:
+            assert isinstance(http_client, AsyncClient)
+        downloader = _current_downloader()
+        if downloader is not None:
+            return await downloader.read(self, http_client)
         if http_client is None:
             raise ValueError("需要提供 http_client 来下载附件")
-        assert isinstance(http_client, AsyncClient)
         url = self.url if self.url.startswith("http") else "http://" + self.url
         return (await http_client.get(url)).content
 
+    def stream(self, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """按块迭代附件内容 (需要 Litetower 运行中)"""
+        return _require_downloader().stream(self, chunk_size)
+
+    async def save(self, path: Union[str, os.PathLike[str]]) -> Path:
+        """将附件保存到指定路径 (需要 Litetower 运行中)"""
+        return await _require_downloader().save(self, path)
+
 
 class Attachments(RootModel[List[Attachment]]):
     """消息附件"""
@@ -38,3 +59,25 @@ class Attachments(RootModel[List[Attachment]]):
     @property
     def attachments(self) -> List[Attachment]:
         return self.root
+
+
+_downloader: Optional["AttachmentDownloader"] = None
+
+
+def configure_downloader(downloader: Optional["AttachmentDownloader"]) -> None:
+    """设置附件使用的下载器，由 Litetower 初始化时调用"""
+    global _downloader
+    _downloader = downloader
+
+
+def _current_downloader() -> Optional["AttachmentDownloader"]:
+    if _downloader is None or _downloader.http_client is None:
+        return None
+    return _downloader
+
+
+def _require_downloader() -> "AttachmentDownloader":
+    downloader = _current_downloader()
+    if downloader is None:
+        raise RuntimeError("Litetower 尚未启动，无法下载附件")
+    return downloader
@@ -1,7 +1,18 @@
-from pydantic import BaseModel
+"""回复目标。
 
+``Target`` 是不可变、可哈希的 ``__slots__`` 值类型，可直接作为 dict 键；
+``target_unit`` (群 / 用户 / 频道 openid) 经 ``sys.intern`` 驻留，大量重复的 openid 只保留一份字符串。
+"""
 
-class Target(BaseModel):
+from __future__ import annotations
+
+import sys
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Target:
     """回复目标"""
 
     target_unit: str = ""
@@ -10,3 +21,15 @@ class Target(BaseModel):
     """被动回复消息时需要的消息 id"""
     event_id: str = ""
     """非用户主动事件触发时需要的 event_id"""
+
+    def __post_init__(self) -> None:
+        if type(self.target_unit) is str:
+            object.__setattr__(self, "target_unit", sys.intern(self.target_unit))
+
+    def model_dump(self) -> Dict[str, str]:
+        """与原 pydantic 模型兼容"""
+        return asdict(self)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None) -> Target:
+        """与原 pydantic 模型兼容：返回替换了部分字段的新目标"""
+        return replace(self, **(update or {}))
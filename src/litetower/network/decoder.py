@@ -0,0 +1,192 @@
+"""Webhook 负载快速解码。
+
+直接读取请求体字节，一次解析为 dict 后由快速工厂构建最终的消息事件，
+不再经过 ``Payload`` / ``EventData`` 的整体校验与二次字段拷贝。
+嵌套结构 (Author / Attachments / Mention 等) 仍按各自模型校验。
+
+JSON 后端可插拔，内置:
+
+- ``orjson``: 需额外安装 orjson
+- ``pydantic``: pydantic_core 自带的 Rust JSON 解析器
+- ``json``: 标准库
+
+``auto`` 按上述顺序选择第一个可用后端，也可通过 ``register_json_backend`` 注册自定义后端。
+
+``configure_compact_events(True)`` 后消息事件改由紧凑事件类构建 (见 ``litetower.events.compact``)。
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, Optional
+
+from litetower.events.compact import COMPACT_EVENTS
+from litetower.events.message import (
+    C2CMessage,
+    ChannelMessage,
+    DirectMessage,
+    GroupMessage,
+)
+from litetower.models.author import Author
+from litetower.models.content import Content
+from litetower.models.elements import Attachments
+from litetower.models.elements.guild import GuildMember, Mention
+from litetower.models.elements.normal import Group, Member
+from litetower.models.scene import MessageScene
+
+JsonLoads = Callable[[bytes], Any]
+"""JSON 后端：bytes -> 解析结果"""
+
+
+# ===== JSON 后端 =====
+
+def _load_orjson() -> JsonLoads:
+    import orjson
+
+    return orjson.loads
+
+
+def _load_pydantic() -> JsonLoads:
+    from pydantic_core import from_json
+
+    return from_json
+
+
+def _load_stdlib() -> JsonLoads:
+    return json.loads
+
+
+JSON_BACKENDS: Dict[str, Callable[[], JsonLoads]] = {
+    "orjson": _load_orjson,
+    "pydantic": _load_pydantic,
+    "json": _load_stdlib,
+}
+"""后端名 -> 后端加载函数；加载函数在依赖缺失时抛出 ImportError。"""
+
+
+def register_json_backend(name: str, loader: Callable[[], JsonLoads]) -> None:
+    """注册自定义 JSON 后端"""
+    JSON_BACKENDS[name] = loader
+
+
+def get_json_backend(name: str = "auto") -> JsonLoads:
+    """按名称获取 JSON 后端，``auto`` 时选择第一个可用的内置后端。"""
+    if name != "auto":
+        if name not in JSON_BACKENDS:
+            raise ValueError(f"未知的 JSON 后端: {name}")
+        return JSON_BACKENDS[name]()
+    for loader in JSON_BACKENDS.values():
+        try:
+            return loader()
+        except ImportError:
+            continue
+    return json.loads
+
+
+# ===== 快速事件工厂 =====
+
+def _author(d: Dict[str, Any]) -> Author:
+    raw = d.get("author")
+    return Author.model_validate(raw) if raw else Author()
+
+
+def _attachments(d: Dict[str, Any]) -> Optional[Attachments]:
+    raw = d.get("attachments")
+    return Attachments.model_validate(raw) if raw is not None else None
+
+
+def _message_scene(d: Dict[str, Any]) -> Optional[MessageScene]:
+    raw = d.get("message_scene")
+    return MessageScene.model_validate(raw) if raw is not None else None
+
+
+def _guild_member(d: Dict[str, Any]) -> GuildMember:
+    raw = d.get("member")
+    return GuildMember.model_validate(raw) if raw else GuildMember()
+
+
+def _fast_group_message(d: Dict[str, Any], payload_id: str) -> GroupMessage:
+    author = _author(d)
+    return GroupMessage(
+        id=d.get("id") or payload_id,
+        content=Content(d.get("content") or ""),
+        timestamp=str(d.get("timestamp") or ""),
+        author=author,
+        group=Group(
+            group_id=d.get("group_id") or "",
+            group_openid=d.get("group_openid") or "",
+        ),
+        member=Member(member_openid=author.member_openid or ""),
+        message_scene=_message_scene(d),
+        attachments=_attachments(d),
+    )
+
+
+def _fast_c2c_message(d: Dict[str, Any], payload_id: str) -> C2CMessage:
+    author = _author(d)
+    if openid := d.get("openid"):
+        author.user_openid = openid
+    return C2CMessage(
+        id=d.get("id") or payload_id,
+        content=Content(d.get("content") or ""),
+        timestamp=str(d.get("timestamp") or ""),
+        author=author,
+        message_scene=_message_scene(d),
+        attachments=_attachments(d),
+    )
+
+
+def _fast_channel_message(d: Dict[str, Any], payload_id: str) -> ChannelMessage:
+    mentions = d.get("mentions")
+    return ChannelMessage(
+        id=d.get("id") or payload_id,
+        content=Content(d.get("content") or ""),
+        timestamp=str(d.get("timestamp") or ""),
+        author=_author(d),
+        channel_id=d.get("channel_id") or "",
+        guild_id=d.get("guild_id") or "",
+        mentions=[Mention.model_validate(m) for m in mentions] if mentions else [],
+        member=_guild_member(d),
+        attachments=_attachments(d),
+        seq=int(d.get("seq") or 0),
+        seq_in_channel=int(d.get("seq_in_channel") or 0),
+    )
+
+
+def _fast_direct_message(d: Dict[str, Any], payload_id: str) -> DirectMessage:
+    return DirectMessage(
+        id=d.get("id") or payload_id,
+        content=Content(d.get("content") or ""),
+        timestamp=str(d.get("timestamp") or ""),
+        author=_author(d),
+        channel_id=d.get("channel_id") or "",
+        guild_id=d.get("guild_id") or "",
+        member=_guild_member(d),
+        attachments=_attachments(d),
+        seq=int(d.get("seq") or 0),
+        seq_in_channel=int(d.get("seq_in_channel") or 0),
+        direct_message=d.get("direct_message") or False,
+        src_guild_id=d.get("src_guild_id") or "",
+    )
+
+
+FAST_FACTORIES: Dict[str, Callable[[Dict[str, Any], str], Any]] = {
+    "GROUP_AT_MESSAGE_CREATE": _fast_group_message,
+    "C2C_MESSAGE_CREATE": _fast_c2c_message,
+    "AT_MESSAGE_CREATE": _fast_channel_message,
+    "DIRECT_MESSAGE_CREATE": _fast_direct_message,
+}
+"""事件类型 -> 直接从原始 dict 构建事件的工厂"""
+
+_factories: Dict[str, Callable[[Dict[str, Any], str], Any]] = FAST_FACTORIES
+
+
+def configure_compact_events(enabled: bool) -> None:
+    """设置消息事件是否使用紧凑表示"""
+    global _factories
+    _factories = COMPACT_EVENTS if enabled else FAST_FACTORIES
+
+
+def fast_factory(event_type: str) -> Optional[Callable[[Dict[str, Any], str], Any]]:
+    """当前生效的快速工厂；非消息事件返回 None"""
+    return _factories.get(event_type)
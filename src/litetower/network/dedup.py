@@ -0,0 +1,246 @@
+"""Webhook 事件去重。
+
+QQ 开放平台在 webhook 响应超时时会重投同一事件，
+此模块记录近期成功接收 (入队或分发) 的负载 id，重复投递直接 ACK 而不再分发；
+分发失败的负载不会被记录，平台重投时仍会处理。
+
+两种实现内存占用均有上界：
+
+- ``TTLDeduplicator``: 按时间分桶的 LRU，精确判重，容量满时淘汰最旧的桶
+- ``BloomDeduplicator``: 双代轮换的 Bloom filter，内存固定，存在可配置的误判率
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Set
+
+from litetower.config.server import DedupConfig
+
+
+@dataclass
+class DedupStats:
+    """去重指标"""
+
+    hits: int = 0
+    """命中 (判定为重复投递) 次数"""
+    misses: int = 0
+    """未命中 (首次出现) 次数"""
+    evicted: int = 0
+    """因过期或容量淘汰的记录数 (Bloom 模式下为轮换次数)"""
+
+
+def payload_key(data: Dict[str, Any]) -> str:
+    """取负载的去重键：优先 ``Payload.id``，缺省时回退到 ``EventData.id``。"""
+    key = data.get("id")
+    if not key:
+        d = data.get("d")
+        if isinstance(d, dict):
+            key = d.get("id")
+    return key or ""
+
+
+class Deduplicator(ABC):
+    """去重器基类。
+
+    子类需实现 ``_contains`` / ``_add`` / ``__len__``。
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.stats = DedupStats()
+
+    @abstractmethod
+    def _contains(self, key: str, now: float) -> bool:
+        """key 在 TTL 内是否已记录"""
+
+    @abstractmethod
+    def _add(self, key: str, now: float) -> None:
+        """记录 key"""
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def check(self, key: str) -> bool:
+        """检查 key 是否在 TTL 内已记录，不记录 key。
+
+        Returns:
+            key 在 TTL 内已记录时为 True。
+        """
+        if not key:
+            return False
+        if self._contains(key, time.monotonic()):
+            self.stats.hits += 1
+            return True
+        self.stats.misses += 1
+        return False
+
+    def record(self, key: str) -> None:
+        """记录 key (负载已成功接收后调用)"""
+        if key:
+            self._add(key, time.monotonic())
+
+    def seen(self, key: str) -> bool:
+        """检查并记录 key。
+
+        Returns:
+            key 在 TTL 内已出现过时为 True。
+        """
+        if self.check(key):
+            return True
+        self.record(key)
+        return False
+
+
+class TTLDeduplicator(Deduplicator):
+    """按时间分桶的 TTL-LRU 去重器。
+
+    将 TTL 切分为 ``buckets`` 个等长时间窗，每个窗口一个 set，
+    过期时整桶丢弃，避免逐条记录时间戳。单个桶写满 ``capacity / buckets``
+    条时也会提前切换，因此容量淘汰每次只丢弃约 1/buckets 的记录。
+    命中时 key 会被移入当前桶。
+    """
+
+    def __init__(self, ttl: float, capacity: int, buckets: int = 8):
+        super().__init__(ttl)
+        buckets = max(buckets, 1)
+        self.capacity = max(capacity, 1)
+        self._span = ttl / buckets
+        self._bucket_size = max(self.capacity // buckets, 1)
+        self._buckets: Deque[tuple[float, Set[str]]] = deque()
+        self._size = 0
+
+    def _rotate(self, now: float) -> Set[str]:
+        buckets = self._buckets
+        # 丢弃整桶过期的窗口
+        while buckets and buckets[0][0] + self.ttl + self._span <= now:
+            _, expired = buckets.popleft()
+            self._size -= len(expired)
+            self.stats.evicted += len(expired)
+        if (
+            not buckets
+            or buckets[-1][0] + self._span <= now
+            or len(buckets[-1][1]) >= self._bucket_size
+        ):
+            buckets.append((now, set()))
+        return buckets[-1][1]
+
+    def _contains(self, key: str, now: float) -> bool:
+        current = self._rotate(now)
+        if key in current:
+            return True
+        for _, bucket in self._buckets:
+            if key in bucket:
+                # LRU: 刷新到当前桶
+                bucket.discard(key)
+                current.add(key)
+                return True
+        return False
+
+    def _add(self, key: str, now: float) -> None:
+        current = self._rotate(now)
+        if key in current:
+            return
+        for _, bucket in self._buckets:
+            if key in bucket:
+                bucket.discard(key)
+                current.add(key)
+                return
+
+        # 容量淘汰: 从最旧的桶开始整桶丢弃
+        if self._size >= self.capacity:
+            while self._size >= self.capacity and self._buckets:
+                _, oldest = self._buckets.popleft()
+                self._size -= len(oldest)
+                self.stats.evicted += len(oldest)
+            current = self._rotate(now)
+
+        current.add(key)
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class BloomDeduplicator(Deduplicator):
+    """双代轮换的 Bloom filter 去重器。
+
+    每隔 TTL (或当前代写满 ``capacity`` 条) 轮换一次：当前代成为上一代，
+    上一代清空复用。查询同时检查两代，因此 key 至多保留 2×TTL，
+    且误判率不会因超量写入而失控。
+    内存固定为 ``2 × m`` bit，与事件量无关。
+    """
+
+    def __init__(self, ttl: float, capacity: int, error_rate: float = 0.001):
+        super().__init__(ttl)
+        n = self.capacity = max(capacity, 1)
+        p = min(max(error_rate, 1e-9), 0.5)
+        self._bits = max(int(-n * math.log(p) / (math.log(2) ** 2)), 8)
+        self._hashes = max(int(round(self._bits / n * math.log(2))), 1)
+        self._nbytes = (self._bits + 7) // 8
+        self._current = bytearray(self._nbytes)
+        self._previous = bytearray(self._nbytes)
+        self._count = 0
+        self._rotated_at: Optional[float] = None
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self._bits
+        return [(h1 + i * h2) % m for i in range(self._hashes)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: list[int]) -> bool:
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+    def _rotate(self, now: float) -> None:
+        if self._rotated_at is None:
+            self._rotated_at = now
+        elif now - self._rotated_at >= self.ttl or self._count >= self.capacity:
+            if now - self._rotated_at >= 2 * self.ttl:
+                # 空闲超过两代，两代都已过期
+                self._current[:] = bytes(self._nbytes)
+            self._previous, self._current = self._current, self._previous
+            self._current[:] = bytes(self._nbytes)
+            self._count = 0
+            self._rotated_at = now
+            self.stats.evicted += 1
+
+    def _contains(self, key: str, now: float) -> bool:
+        self._rotate(now)
+        positions = self._positions(key)
+        if self._test(self._current, positions):
+            return True
+        if self._test(self._previous, positions):
+            # 刷新到当前代
+            self._set(positions)
+            return True
+        return False
+
+    def _add(self, key: str, now: float) -> None:
+        self._rotate(now)
+        positions = self._positions(key)
+        if not self._test(self._current, positions):
+            self._set(positions)
+
+    def _set(self, positions: list[int]) -> None:
+        current = self._current
+        for pos in positions:
+            current[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def create_deduplicator(config: DedupConfig) -> Deduplicator:
+    """按配置创建去重器"""
+    if config.mode == "bloom":
+        return BloomDeduplicator(config.ttl, config.capacity, config.error_rate)
+    return TTLDeduplicator(config.ttl, config.capacity)
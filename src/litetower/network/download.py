@@ -0,0 +1,320 @@
+"""附件流式下载与磁盘缓存。
+
+附件以 URL 的 sha256 为文件名缓存在磁盘上，按总大小做 LRU 淘汰 (正在读取的文件不会被淘汰)；
+并发请求同一附件时共享一次下载，全局下载并发受信号量限制。
+多个插件处理同一张图片时只下载一次，也无需各自在内存中持有完整副本。
+
+缓存目录必须是当前用户私有的目录 (非符号链接、属主为当前用户、其他用户不可访问)，
+否则改用本进程独占的临时目录，避免其他本地用户预先放置的文件被当作附件内容。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import stat
+import tempfile
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Union
+
+from httpx import AsyncClient
+
+from litetower.logging import logger
+
+from litetower.config.api import DownloadConfig
+from litetower.models.elements import Attachment
+
+
+_CACHE_NAME = re.compile(r"[0-9a-f]{64}")
+_TMP_NAME = re.compile(r"\.[0-9a-f]{64}\.\d+\.\d+\.tmp")
+_STALE_TMP = 3600.0
+"""临时文件超过该秒数未被写入才视为遗留 (缓存目录可能由多个进程共享)"""
+
+
+@dataclass
+class DownloadStats:
+    """附件下载指标"""
+
+    downloads: int = 0
+    """实际发起的下载次数"""
+    downloaded_bytes: int = 0
+    """累计下载字节数"""
+    hits: int = 0
+    """命中磁盘缓存的次数"""
+    shared: int = 0
+    """加入进行中下载的次数"""
+    evicted: int = 0
+    """因缓存大小被淘汰的文件数"""
+
+
+def default_cache_dir() -> Path:
+    """默认缓存目录：系统临时目录下按用户区分的 ``litetower-attachments-<uid>``"""
+    getuid = getattr(os, "getuid", None)
+    name = f"litetower-attachments-{getuid()}" if getuid is not None else "litetower-attachments"
+    return Path(tempfile.gettempdir()) / name
+
+
+def _secure_directory(path: Path) -> bool:
+    """创建 (如不存在) 并校验缓存目录：不是符号链接、属主为当前用户且其他用户不可访问"""
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode):
+            return False
+        getuid = getattr(os, "getuid", None)
+        if getuid is None:
+            # Windows：临时目录本身按用户隔离
+            return True
+        if st.st_uid != getuid() or st.st_mode & 0o022:
+            # 其他用户可能已在其中放置文件
+            return False
+        if st.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    except OSError:
+        return False
+    return True
+
+
+def attachment_url(attachment: Attachment) -> str:
+    """附件的完整下载地址 (平台下发的 URL 可能不带协议)"""
+    url = attachment.url
+    return url if url.startswith("http") else "http://" + url
+
+
+def attachment_key(attachment: Attachment) -> str:
+    """附件的缓存键"""
+    return hashlib.sha256(attachment_url(attachment).encode()).hexdigest()
+
+
+class AttachmentDownloader:
+    """带磁盘缓存与并发限制的附件下载器"""
+
+    def __init__(
+        self,
+        config: Optional[DownloadConfig] = None,
+        http_client: Optional[AsyncClient] = None,
+    ):
+        self.config = config or DownloadConfig()
+        self.http_client = http_client
+        self.stats = DownloadStats()
+        self.directory: Optional[Path] = (
+            Path(self.config.cache_dir) if self.config.cache_dir else default_cache_dir()
+        ) if self.config.cache else None
+        self._semaphore = asyncio.Semaphore(max(self.config.max_concurrency, 1))
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._total = 0
+        self._index_task: Optional[asyncio.Future[None]] = None
+        self._inflight: Dict[str, asyncio.Future[Path]] = {}
+        self._pins: Dict[str, int] = {}
+        """正在读取的缓存条目 -> 读取者数量，淘汰时跳过"""
+
+    def _client(self, http_client: Optional[AsyncClient]) -> AsyncClient:
+        client = http_client or self.http_client
+        if client is None:
+            raise RuntimeError("下载器尚未绑定 http_client")
+        return client
+
+    # ===== 公开接口 =====
+
+    async def stream(
+        self,
+        attachment: Attachment,
+        chunk_size: Optional[int] = None,
+        http_client: Optional[AsyncClient] = None,
+    ) -> AsyncIterator[bytes]:
+        """按块迭代附件内容"""
+        chunk_size = chunk_size or self.config.chunk_size
+        if self.directory is None:
+            async with self._semaphore:
+                async with self._client(http_client).stream(
+                    "GET", attachment_url(attachment)
+                ) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        self.stats.downloaded_bytes += len(chunk)
+                        yield chunk
+                    self.stats.downloads += 1
+            return
+
+        async with self._open(attachment, http_client) as f:
+            while chunk := await asyncio.to_thread(f.read, chunk_size):
+                yield chunk
+
+    async def read(
+        self, attachment: Attachment, http_client: Optional[AsyncClient] = None
+    ) -> bytes:
+        """读取完整的附件内容"""
+        if self.directory is None:
+            return b"".join([chunk async for chunk in self.stream(attachment, http_client=http_client)])
+        async with self._open(attachment, http_client) as f:
+            return await asyncio.to_thread(f.read)
+
+    async def save(
+        self,
+        attachment: Attachment,
+        destination: Union[str, os.PathLike[str]],
+        http_client: Optional[AsyncClient] = None,
+    ) -> Path:
+        """保存附件到指定路径"""
+        destination = Path(destination)
+        if self.directory is None:
+            with destination.open("wb") as f:
+                async for chunk in self.stream(attachment, http_client=http_client):
+                    f.write(chunk)
+            return destination
+        async with self._open(attachment, http_client) as f:
+            await asyncio.to_thread(_copy_to, f, destination)
+        return destination
+
+    async def fetch(
+        self, attachment: Attachment, http_client: Optional[AsyncClient] = None
+    ) -> Path:
+        """确保附件位于磁盘缓存中并返回其路径
+
+        并发请求同一附件时共享一次下载；单个调用方被取消不会中断共享的下载。
+        """
+        if self.directory is None:
+            raise RuntimeError("附件磁盘缓存未启用")
+        if self._index_task is None:
+            self._index_task = asyncio.ensure_future(asyncio.to_thread(self._load_index))
+        await self._index_task
+
+        key = attachment_key(attachment)
+        path = self.directory / key
+        if key in self._index:
+            if path.exists():
+                self._index.move_to_end(key)
+                self.stats.hits += 1
+                await asyncio.to_thread(os.utime, path)
+                return path
+            self._total -= self._index.pop(key)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._download(attachment, key, path, http_client))
+            task.add_done_callback(_retrieve_exception)
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats.shared += 1
+        return await asyncio.shield(task)
+
+    @asynccontextmanager
+    async def _open(
+        self, attachment: Attachment, http_client: Optional[AsyncClient]
+    ) -> AsyncIterator[BinaryIO]:
+        """打开缓存中的附件；打开期间该条目不会被淘汰"""
+        key = attachment_key(attachment)
+        self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            path = await self.fetch(attachment, http_client)
+            with path.open("rb") as f:
+                yield f
+        finally:
+            if self._pins[key] > 1:
+                self._pins[key] -= 1
+            else:
+                del self._pins[key]
+                # 读取期间被跳过的淘汰
+                if self.directory is not None:
+                    self._evict()
+
+    # ===== 缓存维护 =====
+
+    async def _download(
+        self,
+        attachment: Attachment,
+        key: str,
+        path: Path,
+        http_client: Optional[AsyncClient],
+    ) -> Path:
+        assert self.directory is not None
+        tmp = self.directory / f".{key}.{os.getpid()}.{id(asyncio.current_task())}.tmp"
+        size = 0
+        async with self._semaphore:
+            try:
+                async with self._client(http_client).stream(
+                    "GET", attachment_url(attachment)
+                ) as response:
+                    response.raise_for_status()
+                    with tmp.open("wb") as f:
+                        async for chunk in response.aiter_bytes(self.config.chunk_size):
+                            f.write(chunk)
+                            size += len(chunk)
+                os.replace(tmp, path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+        self.stats.downloads += 1
+        self.stats.downloaded_bytes += size
+        self._index[key] = size
+        self._total += size
+        self._evict()
+        return path
+
+    def _evict(self) -> None:
+        assert self.directory is not None
+        # 保留最近加入的条目，即使它本身超过了缓存上限；跳过正在读取的条目
+        for key in list(self._index)[:-1]:
+            if self._total <= self.config.cache_size:
+                break
+            if key in self._pins:
+                continue
+            self._total -= self._index.pop(key)
+            self.stats.evicted += 1
+            try:
+                os.unlink(self.directory / key)
+            except OSError:
+                pass
+
+    def _load_index(self) -> None:
+        """扫描缓存目录重建 LRU 索引 (按 mtime 排序)，清理遗留的临时文件
+
+        只处理本下载器命名的文件：其他进程正在写入的临时文件与无关文件保持不变。
+        """
+        assert self.directory is not None
+        if not _secure_directory(self.directory):
+            private = Path(tempfile.mkdtemp(prefix="litetower-attachments-"))
+            logger.warning(f"附件缓存目录 {self.directory} 不是当前用户私有的目录，改用 {private}")
+            weakref.finalize(self, shutil.rmtree, private, True)
+            self.directory = private
+            return
+        try:
+            entries = []
+            stale = time.time() - _STALE_TMP
+            for entry in os.scandir(self.directory):
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat()
+                if _TMP_NAME.fullmatch(entry.name):
+                    if st.st_mtime < stale:
+                        # 中断的下载
+                        os.unlink(entry.path)
+                    continue
+                if _CACHE_NAME.fullmatch(entry.name):
+                    entries.append((st.st_mtime, entry.name, st.st_size))
+        except OSError as e:
+            logger.warning(f"附件缓存目录不可用: {e}")
+            return
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total += size
+        self._evict()
+
+
+def _copy_to(source: BinaryIO, destination: Path) -> None:
+    with destination.open("wb") as f:
+        shutil.copyfileobj(source, f)
+
+
+def _retrieve_exception(future: asyncio.Future[Any]) -> None:
+    if not future.cancelled():
+        future.exception()
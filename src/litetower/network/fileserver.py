@@ -0,0 +1,171 @@
+"""媒体文件服务器。
+
+替代直接挂载 ``StaticFiles``，面向平台 CDN 拉取大文件的场景:
+
+- 强 ETag：内容寻址文件 (文件名为 sha256) 直接使用文件名，其余文件按内容计算并缓存
+- 条件请求 (If-None-Match) 与 Range / If-Range 请求
+- 全局与单客户端的并发传输上限，超出时返回 429
+- 文件在线程池中分块读取后发送 (内置的 Uvicorn 即是如此)；仅当 ASGI 服务器声明
+  ``http.response.pathsend`` 扩展时，非 Range 响应交由服务器直接发送文件
+- ETag 的内容哈希在线程池中计算，缓存只在事件循环中读写
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import stat
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
+
+from litetower.config.server import FileServerConfig
+
+_CONTENT_ADDRESSED = re.compile(r"^[0-9a-f]{64}$")
+_ETAG_CACHE_SIZE = 4096
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class FileServerStats:
+    """文件服务器指标"""
+
+    served: int = 0
+    """开始传输的请求数"""
+    not_modified: int = 0
+    """命中 If-None-Match 返回 304 的请求数"""
+    rejected: int = 0
+    """超出并发上限返回 429 的请求数"""
+    active: int = 0
+    """当前进行中的传输数"""
+
+
+class _TrackedFileResponse(FileResponse):
+    chunk_size = 256 * 1024
+
+    def __init__(self, *args: Any, release: Callable[[], None], **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._release = release
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._release()
+
+
+class MediaFileServer:
+    """以 ``FileServerConfig.localpath`` 为根目录的媒体文件路由"""
+
+    def __init__(self, config: FileServerConfig):
+        self.config = config
+        self.root = Path(config.localpath).resolve()
+        self.stats = FileServerStats()
+        self._clients: Dict[str, int] = {}
+        self._etags: OrderedDict[Tuple[str, int, int], str] = OrderedDict()
+
+    @property
+    def route(self) -> Route:
+        prefix = "/" + self.config.remote_url.strip("/")
+        return Route(
+            f"{prefix}/{{path:path}}",
+            self.endpoint,
+            methods=["GET", "HEAD"],
+            name="fileserver",
+        )
+
+    def _resolve(self, relative: str) -> Optional[Path]:
+        path = (self.root / relative).resolve()
+        if path != self.root and self.root not in path.parents:
+            return None
+        return path
+
+    async def _etag_for(self, path: Path, st: os.stat_result) -> str:
+        if _CONTENT_ADDRESSED.match(path.stem):
+            return path.stem
+        key = (str(path), st.st_size, st.st_mtime_ns)
+        etag = self._etags.get(key)
+        if etag is not None:
+            self._etags.move_to_end(key)
+            return etag
+        etag = await anyio.to_thread.run_sync(_file_digest, path)
+        self._etags[key] = etag
+        self._etags.move_to_end(key)
+        while len(self._etags) > _ETAG_CACHE_SIZE:
+            self._etags.popitem(last=False)
+        return etag
+
+    def _acquire(self, client: str) -> bool:
+        config = self.config
+        if config.max_transfers and self.stats.active >= config.max_transfers:
+            return False
+        count = self._clients.get(client, 0)
+        if config.max_transfers_per_client and count >= config.max_transfers_per_client:
+            return False
+        self._clients[client] = count + 1
+        self.stats.active += 1
+        return True
+
+    def _release(self, client: str) -> None:
+        self.stats.active -= 1
+        count = self._clients.get(client, 1) - 1
+        if count <= 0:
+            self._clients.pop(client, None)
+        else:
+            self._clients[client] = count
+
+    async def endpoint(self, request: Request) -> Response:
+        path = self._resolve(request.path_params["path"])
+        if path is None:
+            return Response(status_code=404)
+        try:
+            st = await anyio.to_thread.run_sync(os.stat, path)
+        except OSError:
+            return Response(status_code=404)
+        if not stat.S_ISREG(st.st_mode):
+            return Response(status_code=404)
+
+        etag = f'"{await self._etag_for(path, st)}"'
+        immutable = _CONTENT_ADDRESSED.match(path.stem) is not None
+        headers = {
+            "etag": etag,
+            "cache-control": (
+                "public, max-age=31536000, immutable"
+                if immutable
+                else f"public, max-age={self.config.cache_max_age}"
+            ),
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                self.stats.not_modified += 1
+                return Response(status_code=304, headers=headers)
+
+        client = request.client.host if request.client else ""
+        if not self._acquire(client):
+            self.stats.rejected += 1
+            return Response(status_code=429, headers={"retry-after": "1"})
+        self.stats.served += 1
+        return _TrackedFileResponse(
+            path,
+            stat_result=st,
+            headers=headers,
+            release=lambda: self._release(client),
+        )
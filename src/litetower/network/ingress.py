@@ -0,0 +1,144 @@
+"""Webhook 入站队列。
+
+将 webhook 的 ACK 与事件分发解耦：请求处理只做廉价解码并入队，
+由固定数量的 worker 从有界队列中取出负载完成校验、构建与发布。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from litetower.logging import logger
+
+from litetower.config.server import IngressConfig
+
+Dispatcher = Callable[[Dict[str, Any]], Optional[Awaitable[Any]]]
+"""分发函数：接收原始负载，返回可等待对象时 worker 会等待其完成。"""
+
+
+@dataclass
+class IngressStats:
+    """入站队列指标"""
+
+    enqueued: int = 0
+    """成功入队的事件数"""
+    processed: int = 0
+    """worker 已处理完成的事件数"""
+    failed: int = 0
+    """分发过程中抛出异常的事件数"""
+    dropped: int = 0
+    """因 drop_oldest 策略被丢弃的事件数"""
+    rejected: int = 0
+    """因 reject 策略被拒绝 (503) 的事件数"""
+    depth: int = 0
+    """当前队列深度"""
+    max_depth: int = 0
+    """队列深度峰值"""
+
+
+class WebhookIngress:
+    """有界入站队列与 worker 池。"""
+
+    def __init__(self, config: IngressConfig, dispatcher: Dispatcher):
+        self.config = config
+        self.dispatcher = dispatcher
+        self.stats = IngressStats()
+        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(
+            maxsize=max(config.maxsize, 1)
+        )
+        self._workers: List[asyncio.Task[None]] = []
+
+    @property
+    def depth(self) -> int:
+        """当前队列深度"""
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def admit(self) -> bool:
+        """reject 策略下队列已满时拒绝接收 (计入 rejected)，其余情况总是接收。"""
+        if self.config.overflow == "reject" and self._queue.full():
+            self.stats.rejected += 1
+            return False
+        return True
+
+    async def put(self, data: Dict[str, Any]) -> bool:
+        """按溢出策略将负载入队。
+
+        Returns:
+            是否已接收；为 False 时调用方应返回 503 让平台稍后重投。
+        """
+        queue = self._queue
+        if queue.full():
+            overflow = self.config.overflow
+            if overflow == "reject":
+                self.stats.rejected += 1
+                return False
+            if overflow == "drop_oldest":
+                try:
+                    queue.get_nowait()
+                    queue.task_done()
+                    self.stats.dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+                queue.put_nowait(data)
+            else:
+                await queue.put(data)
+        else:
+            queue.put_nowait(data)
+
+        self.stats.enqueued += 1
+        depth = queue.qsize()
+        self.stats.depth = depth
+        if depth > self.stats.max_depth:
+            self.stats.max_depth = depth
+        return True
+
+    def start(self) -> None:
+        """启动 worker 池"""
+        if self._workers:
+            return
+        for i in range(max(self.config.workers, 1)):
+            self._workers.append(
+                asyncio.create_task(self._worker(), name=f"litetower-ingress-{i}")
+            )
+        logger.info(
+            f"入站队列已启动: workers={len(self._workers)}, "
+            f"maxsize={self._queue.maxsize}, overflow={self.config.overflow}"
+        )
+
+    async def stop(self) -> None:
+        """等待队列排空 (最多 drain_timeout 秒) 后停止 worker 池"""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.config.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"入站队列排空超时，剩余 {self.depth} 个事件将被丢弃")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        logger.info("入站队列已停止")
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            data = await queue.get()
+            self.stats.depth = queue.qsize()
+            try:
+                pending = self.dispatcher(data)
+                if pending is not None:
+                    await pending
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.failed += 1
+                logger.exception(f"事件处理失败: {e}")
+            finally:
+                self.stats.processed += 1
+                queue.task_done()
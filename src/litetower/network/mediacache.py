@@ -0,0 +1,147 @@
+"""已上传媒体的 file_info 缓存。
+
+同一份媒体发往同一类目标时，平台返回的 file_info 在其 ttl 内可重复使用。
+缓存以内容哈希 (或 URL) + 目标类型 + 文件类型为键，按 LRU 淘汰，
+可选持久化到 JSON 文件以便重启后继续复用。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from litetower.logging import logger
+
+from litetower.config.api import MediaCacheConfig
+from litetower.message.element import MediaElement
+
+
+@dataclass
+class MediaCacheStats:
+    """file_info 缓存指标"""
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    """因 ttl 到期被移除的条目数"""
+    evicted: int = 0
+    """因容量被 LRU 淘汰的条目数"""
+
+
+def media_key(target_type: str, file_type: int, media: MediaElement) -> str:
+    """计算媒体缓存键：URL 优先，否则使用内容的 sha256"""
+    source = f"url:{media.url}" if media.url else f"sha256:{media.sha256()}"
+    return f"{target_type}:{file_type}:{source}"
+
+
+class MediaCache:
+    """带 ttl 与 LRU 淘汰的 file_info 缓存"""
+
+    def __init__(self, config: Optional[MediaCacheConfig] = None):
+        self.config = config or MediaCacheConfig()
+        self.stats = MediaCacheStats()
+        # key -> (过期时间戳, 上传响应)；使用墙钟时间以便持久化
+        self._entries: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._dirty = False
+        self._saved_at = 0.0
+        if self.config.persist_path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """获取未过期的上传响应"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires, info = entry
+        if expires <= time.time():
+            del self._entries[key]
+            self._dirty = True
+            self.stats.expired += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return dict(info)
+
+    def put(self, key: str, info: Dict[str, Any]) -> None:
+        """缓存上传响应，有效期取响应中的 ttl"""
+        ttl = info.get("ttl") or self.config.default_ttl
+        expires = time.time() + float(ttl) - self.config.margin
+        if expires <= time.time():
+            return
+        self._entries[key] = (expires, dict(info))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.config.capacity:
+            self._entries.popitem(last=False)
+            self.stats.evicted += 1
+        self._dirty = True
+        if (
+            self.config.persist_path
+            and time.monotonic() - self._saved_at >= self.config.persist_interval
+        ):
+            self.save()
+
+    def invalidate(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._dirty = True
+
+    def load(self) -> None:
+        """从持久化文件加载未过期的条目"""
+        path = Path(self.config.persist_path or "")
+        if not path.is_file():
+            return
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取媒体缓存失败: {e}")
+            return
+        if not isinstance(raw, dict):
+            logger.warning(f"媒体缓存文件格式错误，已忽略: {path}")
+            return
+        now = time.time()
+        skipped = 0
+        for key, entry in raw.items():
+            # 文件可能被截断或手工修改，逐条校验 [expires, info]
+            if (
+                not isinstance(entry, list)
+                or len(entry) != 2
+                or not isinstance(entry[0], (int, float))
+                or isinstance(entry[0], bool)
+                or not isinstance(entry[1], dict)
+            ):
+                skipped += 1
+                continue
+            expires, info = entry
+            if expires > now:
+                self._entries[key] = (float(expires), info)
+        if skipped:
+            logger.warning(f"媒体缓存文件中有 {skipped} 个无效条目，已跳过: {path}")
+        while len(self._entries) > self.config.capacity:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """将缓存原子地写入持久化文件"""
+        self._saved_at = time.monotonic()
+        if not self.config.persist_path or not self._dirty:
+            return
+        path = Path(self.config.persist_path)
+        now = time.time()
+        data = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+        tmp = path.with_name(f"{path.name}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"写入媒体缓存失败: {e}")
+            return
+        self._dirty = False
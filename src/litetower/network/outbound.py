@@ -0,0 +1,173 @@
+"""按目标分道的有序发送队列。
+
+每个 (target_type, target_unit) 对应一条发送通道，通道内按入队顺序串行发送，
+不同通道之间并发执行。``enqueue`` 立即返回 Future，处理器无需等待 HTTP 往返。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from litetower.logging import logger
+
+from litetower.config.outbound import OutboundConfig
+
+T = TypeVar("T")
+
+LaneKey = Tuple[str, str]
+"""(target_type, target_unit)"""
+
+_EWMA_ALPHA = 0.2
+
+
+@dataclass
+class OutboundStats:
+    """发送队列指标"""
+
+    enqueued: int = 0
+    """累计入队的消息数"""
+    sent: int = 0
+    """发送成功的消息数"""
+    failed: int = 0
+    """发送失败的消息数"""
+    pending: int = 0
+    """当前排队 (含发送中) 的消息数"""
+    max_lane_depth: int = 0
+    """单条通道的排队深度峰值"""
+
+
+@dataclass
+class LaneStats:
+    """单条发送通道的指标"""
+
+    depth: int = 0
+    """当前排队 (含发送中) 的消息数"""
+    wait: float = 0.0
+    """入队到开始发送的耗时 (秒, EWMA)"""
+    latency: float = 0.0
+    """单次发送耗时 (秒, EWMA)"""
+
+
+class _Lane:
+    __slots__ = ("queue", "task", "stats")
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[Tuple[Callable[[], Awaitable[Any]], asyncio.Future[Any], float]] = asyncio.Queue()
+        self.task: Optional[asyncio.Task[None]] = None
+        self.stats = LaneStats()
+
+
+class OutboundDispatcher:
+    """按目标分道的有序发送调度器。"""
+
+    def __init__(self, config: Optional[OutboundConfig] = None):
+        self.config = config or OutboundConfig()
+        self.stats = OutboundStats()
+        self._lanes: Dict[LaneKey, _Lane] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(self.config.max_concurrency)
+            if self.config.max_concurrency > 0
+            else None
+        )
+
+    @property
+    def lanes(self) -> Dict[LaneKey, LaneStats]:
+        """当前活跃通道及其指标"""
+        return {key: lane.stats for key, lane in self._lanes.items()}
+
+    def enqueue(
+        self,
+        target_type: str,
+        target_unit: str,
+        send: Callable[[], Awaitable[T]],
+    ) -> asyncio.Future[T]:
+        """将发送操作放入目标通道，立即返回其结果的 Future。
+
+        未被等待的 Future 发送失败时仅记录日志，不会产生未取回异常的警告。
+        """
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_retrieve_exception)
+
+        key = (target_type, target_unit)
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane()
+            lane.task = asyncio.create_task(
+                self._run_lane(key, lane), name=f"litetower-outbound-{target_type}"
+            )
+
+        lane.queue.put_nowait((send, future, time.monotonic()))
+        lane.stats.depth += 1
+        self.stats.enqueued += 1
+        self.stats.pending += 1
+        if lane.stats.depth > self.stats.max_lane_depth:
+            self.stats.max_lane_depth = lane.stats.depth
+        return future
+
+    async def _run_lane(self, key: LaneKey, lane: _Lane) -> None:
+        queue = lane.queue
+        stats = lane.stats
+        while True:
+            try:
+                send, future, enqueued_at = await asyncio.wait_for(
+                    queue.get(), self.config.idle_timeout
+                )
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    self._lanes.pop(key, None)
+                    return
+                continue
+
+            started = time.monotonic()
+            stats.wait += _EWMA_ALPHA * (started - enqueued_at - stats.wait)
+            try:
+                if future.cancelled():
+                    continue
+                if self._semaphore is not None:
+                    async with self._semaphore:
+                        result = await send()
+                else:
+                    result = await send()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error(f"消息发送失败 -> {key[0]}({key[1]}): {e}")
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.stats.sent += 1
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                stats.latency += _EWMA_ALPHA * (time.monotonic() - started - stats.latency)
+                stats.depth -= 1
+                self.stats.pending -= 1
+                queue.task_done()
+
+    async def close(self) -> None:
+        """等待已入队的消息发送完毕 (最多 drain_timeout 秒) 后停止所有通道"""
+        lanes = list(self._lanes.values())
+        if not lanes:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(lane.queue.join() for lane in lanes)),
+                self.config.drain_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"发送队列排空超时，剩余 {self.stats.pending} 条消息未发送")
+        tasks = [lane.task for lane in lanes if lane.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._lanes.clear()
+
+
+def _retrieve_exception(future: asyncio.Future[Any]) -> None:
+    if not future.cancelled():
+        future.exception()
@@ -2,17 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 from enum import Enum
 from typing import Any, Dict, Literal, Optional, Union
 
 from litetower.logging import logger
-from httpx import AsyncClient
+from httpx import AsyncClient, ConnectError, ConnectTimeout, PoolTimeout, TransportError
 
 from litetower.message.element import Element, MediaElement
 from litetower.models.api import OpenAPIError
+from litetower.network.mediacache import MediaCache, media_key
+from litetower.network.ratelimit import (
+    THROTTLE_CODES,
+    RateLimiter,
+    RateLimitTimeout,
+    parse_retry_after,
+)
+from litetower.network.retry import DUPLICATE_CODES, RetryPolicy
+from litetower.network.upload import Base64JsonBody, MediaStager, should_stream
 from litetower.utils import get_msg_type
 
+_UNSENT_ERRORS = (ConnectError, ConnectTimeout, PoolTimeout)
+"""请求未发出的传输层错误，任何请求都可以安全重试"""
+
 
 class MessageTarget(str, Enum):
     """消息发送目标类型"""
@@ -63,6 +77,10 @@ class QQAPI:
 
     通过持有 auth_service 引用实现 token 自动刷新。
     API 错误统一抛出 OpenAPIError 异常。
+    传入 ratelimiter 时，带 route 的请求先在对应令牌桶上排队；
+    传入 retry_policy 时，瞬时故障按策略以同一请求体重试；
+    传入 media_cache 时，相同媒体在 ttl 内复用已上传的 file_info；
+    传入 stager 时，媒体先暂存到文件服务器，再以 URL 方式上传。
     """
 
     PRODUCTION_URL = "https://api.sgroup.qq.com"
@@ -73,10 +91,18 @@ class QQAPI:
         auth_service: Any,  # QAuthService — 用 Any 避免循环导入
         http_client: AsyncClient,
         sand_box: bool = False,
+        ratelimiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        media_cache: Optional[MediaCache] = None,
+        stager: Optional[MediaStager] = None,
     ):
         self._auth_service = auth_service
         self.http_client = http_client
         self.base_url = self.SANDBOX_URL if sand_box else self.PRODUCTION_URL
+        self.ratelimiter = ratelimiter
+        self.retry_policy = retry_policy
+        self.media_cache = media_cache
+        self.stager = stager
 
     @property
     def access_token(self) -> str:
@@ -93,23 +119,103 @@ class QQAPI:
         self,
         method: str,
         url: str,
+        *,
+        route: Optional[str] = None,
+        target: str = "",
         **kwargs: Any,
     ) -> Dict[str, Any]:
-        """通用 API 请求"""
-        response = await self.http_client.request(
-            method,
-            f"{self.base_url}{url}",
-            headers=self._get_headers(),
-            **kwargs,
-        )
-        data = response.json()
-
-        if response.status_code >= 400:
-            code = data.get("code", response.status_code)
-            message = data.get("message", "Unknown error")
-            raise OpenAPIError(code=code, message=message, data=data)
-
-        return data if isinstance(data, dict) else {"result": data}
+        """通用 API 请求
+
+        Args:
+            route: 路由模板 (``API_PATHS`` 中的值)，用于限流分桶与重试分类；为 None 时不限流
+            target: 路由内的目标 id，用于按目标分桶
+
+        Returns:
+            响应 JSON；重试被平台按 msg_seq 去重 (前一次请求已送达) 时返回 ``{"duplicate": True}``
+        """
+        extra_headers: Optional[Dict[str, str]] = kwargs.pop("headers", None)
+        limiter = self.ratelimiter if route is not None else None
+        bucket_route = route or ""
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.config.budget if policy is not None else 0.0
+        # 可能已被平台受理的请求 (5xx、读超时) 只在可安全重发时重试
+        replay = policy is not None and policy.replayable(route, method, kwargs.get("json"))
+        throttles = 0
+        attempt = 0
+        while True:
+            if limiter is not None:
+                try:
+                    await limiter.acquire(bucket_route, target)
+                except RateLimitTimeout:
+                    raise OpenAPIError(code=429, message=f"本地限流排队超时: {route}")
+
+            attempt += 1
+            headers = self._get_headers()
+            if extra_headers:
+                headers.update(extra_headers)
+            try:
+                response = await self.http_client.request(
+                    method,
+                    f"{self.base_url}{url}",
+                    headers=headers,
+                    **kwargs,
+                )
+            except TransportError as e:
+                if policy is None or not policy.config.transport_errors:
+                    raise
+                if not replay and not isinstance(e, _UNSENT_ERRORS):
+                    raise
+                delay = policy.schedule(route, attempt, deadline)
+                if delay is None:
+                    raise
+                logger.warning(f"请求 {method} {url} 失败 ({e!r})，{delay:.2f}s 后第 {attempt} 次重试")
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+
+            if response.status_code >= 400:
+                error = data if isinstance(data, dict) else {}
+                code = error.get("code", response.status_code)
+                message = error.get("message", "Unknown error")
+                if limiter is not None and (response.status_code == 429 or code in THROTTLE_CODES):
+                    limiter.throttled(bucket_route, target, response.headers)
+                    if throttles < limiter.config.max_retries:
+                        throttles += 1
+                        attempt -= 1
+                        continue
+                if attempt > 1 and code in DUPLICATE_CODES:
+                    # 前一次请求已送达，再次发送 (换新的 msg_seq) 反而会产生重复消息
+                    logger.warning(f"重试请求被平台按 msg_seq 去重，前一次发送已送达: {url}")
+                    if limiter is not None:
+                        limiter.succeeded(bucket_route, target)
+                    if policy is not None:
+                        policy.stats.deduplicated += 1
+                    return {"duplicate": True}
+                if (
+                    policy is not None
+                    and replay
+                    and policy.retryable(route, response.status_code, code)
+                ):
+                    delay = policy.schedule(
+                        route, attempt, deadline, parse_retry_after(response.headers)
+                    )
+                    if delay is not None:
+                        logger.warning(
+                            f"请求 {method} {url} 返回 [{code}] {message}，{delay:.2f}s 后第 {attempt} 次重试"
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+                raise OpenAPIError(code=code, message=message, data=error)
+
+            if limiter is not None:
+                limiter.succeeded(bucket_route, target)
+            if policy is not None and attempt > 1:
+                policy.stats.recovered += 1
+            return data if isinstance(data, dict) else {"result": data}
 
     async def send_message(
         self,
@@ -119,9 +225,10 @@ class QQAPI:
         media_element: Optional[MediaElement] = None,
     ) -> Dict[str, Any]:
         """发送消息"""
-        url = API_PATHS[target_type]["send"].format(target_id=target_id)
+        route = API_PATHS[target_type]["send"]
+        url = route.format(target_id=target_id)
 
-        if media_element and (media_element.data or media_element.url):
+        if media_element and (media_element.has_data or media_element.url):
             file_resp = await self.upload_file(target_type, target_id, media_element)
             message_data["media"] = file_resp
 
@@ -129,8 +236,18 @@ class QQAPI:
         from litetower.logging import log_message_send
         msg_id = message_data.get("msg_id", "UNKNOWN")
         log_message_send(target_type, target_id, msg_id)
-        
-        return await self.request("POST", url, json=message_data)
+
+        try:
+            return await self.request(
+                "POST", url, route=route, target=target_id, json=message_data
+            )
+        except OpenAPIError:
+            # file_info 可能已在平台侧失效，下次发送时重新上传
+            if self.media_cache is not None and "media" in message_data and media_element:
+                self.media_cache.invalidate(
+                    media_key(target_type, _file_type(media_element), media_element)
+                )
+            raise
 
     async def send_channel_message(
         self,
@@ -138,9 +255,12 @@ class QQAPI:
         message_data: Dict[str, Any],
     ) -> Dict[str, Any]:
         """发送子频道消息"""
-        url = API_PATHS["channel"]["send"].format(target_id=channel_id)
+        route = API_PATHS["channel"]["send"]
+        url = route.format(target_id=channel_id)
         logger.debug(f"发送频道消息 -> [{channel_id}]")
-        return await self.request("POST", url, json=message_data)
+        return await self.request(
+            "POST", url, route=route, target=channel_id, json=message_data
+        )
 
     async def send_dms_message(
         self,
@@ -148,9 +268,12 @@ class QQAPI:
         message_data: Dict[str, Any],
     ) -> Dict[str, Any]:
         """发送频道私信消息"""
-        url = API_PATHS["dms"]["send"].format(target_id=guild_id)
+        route = API_PATHS["dms"]["send"]
+        url = route.format(target_id=guild_id)
         logger.debug(f"发送私信消息 -> [{guild_id}]")
-        return await self.request("POST", url, json=message_data)
+        return await self.request(
+            "POST", url, route=route, target=guild_id, json=message_data
+        )
 
     async def recall_message(
         self,
@@ -162,12 +285,13 @@ class QQAPI:
         """撤回消息"""
         from litetower.logging import log_recall
 
-        url = API_PATHS[target_type]["recall"].format(
-            target_id=target_id, message_id=message_id
-        )
+        route = API_PATHS[target_type]["recall"]
+        url = route.format(target_id=target_id, message_id=message_id)
         params = {"hidetip": "true"} if hide_tip else {}
         try:
-            await self.request("DELETE", url, params=params)
+            await self.request(
+                "DELETE", url, route=route, target=target_id, params=params
+            )
             log_recall(target_type, target_id, message_id, success=True)
             return True
         except OpenAPIError as e:
@@ -183,22 +307,46 @@ class QQAPI:
         media: MediaElement,
     ) -> Dict[str, Any]:
         """上传媒体文件"""
-        url = API_PATHS[target_type]["file"].format(target_id=target_id)
+        route = API_PATHS[target_type]["file"]
+        url = route.format(target_id=target_id)
 
-        file_type = 1  # 默认图片
-        from litetower.message.element import Video, Voice
+        file_type = _file_type(media)
 
-        if isinstance(media, Video):
-            file_type = 2
-        elif isinstance(media, Voice):
-            file_type = 3
+        cache = self.media_cache
+        key: Optional[str] = None
+        if cache is not None:
+            # 内容哈希需要读取整个文件，在线程池中计算 (结果缓存在媒体元素上)
+            key = await asyncio.to_thread(media_key, target_type, file_type, media)
+            if (cached := cache.get(key)) is not None:
+                logger.debug(f"复用已上传媒体 -> {target_type}({target_id})")
+                return cached
 
         data: Dict[str, Any] = {"file_type": file_type, "srv_send_msg": False}
+        body: Dict[str, Any] = {"json": data}
 
         if media.url:
             data["url"] = media.url
-        elif media.data:
+        elif self.stager is not None and media.has_data:
+            data["url"] = await self.stager.stage(media)
+        elif should_stream(media):
+            stream = Base64JsonBody(data, "file_data", media)
+            body = {"content": stream, "headers": stream.headers}
+        elif media.inline_data:
             import base64
-            data["file_data"] = base64.b64encode(media.data).decode()
+            data["file_data"] = base64.b64encode(media.inline_data).decode()
+
+        resp = await self.request("POST", url, route=route, target=target_id, **body)
+        if cache is not None and key is not None and resp.get("file_info"):
+            cache.put(key, resp)
+        return resp
+
+
+def _file_type(media: MediaElement) -> int:
+    """媒体文件类型：1 图片 / 2 视频 / 3 语音"""
+    from litetower.message.element import Video, Voice
 
-        return await self.request("POST", url, json=data)
+    if isinstance(media, Video):
+        return 2
+    if isinstance(media, Voice):
+        return 3
+    return 1  # 默认图片
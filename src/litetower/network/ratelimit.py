@@ -0,0 +1,221 @@
+"""按路由与目标的令牌桶限流。
+
+每个 (路由模板, 目标) 对应一个令牌桶。超出限额的请求在桶上按 FIFO 顺序排队等待，
+而不是直接失败。速率可以静态配置，也可以从 429 / Retry-After / 频率限制错误码中学习：
+被限流时暂停整个桶并将速率减半，之后每次成功请求加性恢复，恢复到配置的速率
+(未配置的路由为 ``learn_max_rate``) 后回到未被限流时的状态，空闲时即可回收。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+from litetower.logging import logger
+
+from litetower.config.api import RateLimitConfig, RouteLimit
+
+THROTTLE_CODES = frozenset({11254, 22009})
+"""开放平台表示频率限制的业务错误码"""
+
+
+@dataclass
+class RateLimitStats:
+    """限流指标"""
+
+    acquired: int = 0
+    """通过限流的请求数"""
+    delayed: int = 0
+    """需要排队等待的请求数"""
+    wait_time: float = 0.0
+    """累计排队秒数"""
+    throttled: int = 0
+    """收到限流响应的次数"""
+    timeouts: int = 0
+    """排队超过 max_wait 的请求数"""
+
+
+class RateLimitTimeout(Exception):
+    """排队等待超过 max_wait"""
+
+
+class TokenBucket:
+    """令牌桶。rate 为 0 时不限速，仅受限流暂停影响。"""
+
+    __slots__ = (
+        "rate",
+        "burst",
+        "base_rate",
+        "base_burst",
+        "tokens",
+        "updated",
+        "blocked_until",
+        "learned",
+        "_lock",
+    )
+
+    def __init__(self, rate: float = 0.0, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.base_rate = rate
+        """配置的速率，学习到的速率恢复到该值后不再视为被限流"""
+        self.base_burst = self.burst
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.learned = False
+        # asyncio.Lock 按获取顺序唤醒，保证排队公平
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """距离下一个可用令牌的秒数"""
+        delay = self.blocked_until - now
+        if self.rate > 0:
+            self._refill(now)
+            if self.tokens < 1:
+                delay = max(delay, (1 - self.tokens) / self.rate)
+        return delay
+
+    @property
+    def idle(self) -> bool:
+        """桶已回满且无人排队，可安全回收"""
+        if self._lock.locked() or self.learned:
+            return False
+        now = time.monotonic()
+        return self.delay(now) <= 0 and (self.rate <= 0 or self.tokens >= self.burst)
+
+    async def acquire(self, max_wait: Optional[float] = None) -> float:
+        """取得一个令牌，返回排队等待的秒数"""
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                delay = self.delay(now)
+                if delay <= 0:
+                    if self.rate > 0:
+                        self.tokens -= 1
+                    return now - start
+                if max_wait is not None and now - start + delay > max_wait:
+                    raise RateLimitTimeout
+                await asyncio.sleep(delay)
+
+    def throttle(self, retry_after: float, config: RateLimitConfig) -> None:
+        """收到限流响应：暂停 retry_after 秒，并在允许学习时降低速率"""
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        if not config.learn:
+            return
+        if self.rate <= 0:
+            self.rate = config.learn_initial_rate
+        else:
+            self.rate = max(config.min_rate, self.rate / 2)
+        self.burst = max(1.0, min(self.burst, self.rate))
+        self.tokens = 0.0
+        self.updated = now
+        self.learned = True
+
+    def reward(self, config: RateLimitConfig) -> None:
+        """请求成功：学习到的速率加性恢复，到达配置的速率 (未配置时为 learn_max_rate) 后解除学习状态"""
+        if not self.learned:
+            return
+        ceiling = self.base_rate or config.learn_max_rate
+        self.rate = self.rate + config.learn_increase
+        if self.rate >= ceiling:
+            self.rate = self.base_rate
+            self.burst = self.base_burst
+            self.learned = False
+        else:
+            self.burst = max(1.0, self.rate)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """解析 Retry-After (秒数或 HTTP 日期)"""
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """按路由模板与目标划分令牌桶的限流器"""
+
+    def __init__(self, config: Optional[RateLimitConfig] = None):
+        self.config = config or RateLimitConfig()
+        self.stats = RateLimitStats()
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._prune_at = self.config.max_buckets
+
+    def _key(self, route: str, target: str) -> Tuple[str, str]:
+        limit = self.config.routes.get(route)
+        return (route, target if limit is None or limit.per_target else "")
+
+    def bucket(self, route: str, target: str = "") -> TokenBucket:
+        """获取 (必要时创建) 路由与目标对应的令牌桶"""
+        key = self._key(route, target)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self._prune_at:
+                self._prune()
+            limit: Optional[RouteLimit] = self.config.routes.get(route)
+            bucket = self._buckets[key] = (
+                TokenBucket(limit.rate, limit.burst) if limit is not None else TokenBucket()
+            )
+        return bucket
+
+    def _prune(self) -> None:
+        for key in [key for key, bucket in self._buckets.items() if bucket.idle]:
+            del self._buckets[key]
+        # 仍在使用的桶过多时推迟下一次回收，避免每个新目标都全量扫描
+        self._prune_at = max(self.config.max_buckets, 2 * len(self._buckets))
+
+    async def acquire(self, route: str, target: str = "") -> None:
+        """在路由与目标的令牌桶上排队取得发送许可
+
+        Raises:
+            RateLimitTimeout: 排队时间将超过 max_wait
+        """
+        try:
+            waited = await self.bucket(route, target).acquire(self.config.max_wait)
+        except RateLimitTimeout:
+            self.stats.timeouts += 1
+            raise
+        self.stats.acquired += 1
+        if waited > 0.001:
+            self.stats.delayed += 1
+            self.stats.wait_time += waited
+
+    def throttled(
+        self, route: str, target: str, headers: Mapping[str, str]
+    ) -> float:
+        """记录一次限流响应，返回暂停秒数"""
+        retry_after = parse_retry_after(headers)
+        if retry_after is None:
+            retry_after = self.config.throttle_backoff
+        bucket = self.bucket(route, target)
+        bucket.throttle(retry_after, self.config)
+        self.stats.throttled += 1
+        logger.warning(
+            f"触发频率限制 {route} [{target}]，暂停 {retry_after:.2f}s，速率调整为 {bucket.rate:.2f}/s"
+        )
+        return retry_after
+
+    def succeeded(self, route: str, target: str = "") -> None:
+        """记录一次成功请求"""
+        bucket = self._buckets.get(self._key(route, target))
+        if bucket is not None:
+            bucket.reward(self.config)
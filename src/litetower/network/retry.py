@@ -0,0 +1,104 @@
+"""OpenAPI 瞬时故障的重试策略。
+
+按路由判断状态码 / 业务错误码 / 传输层错误是否可重试，
+以带 full jitter 的指数退避安排重试，并受单个请求的总耗时预算约束。
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from litetower.config.api import RetryConfig
+
+DUPLICATE_CODES = frozenset({40054005})
+"""平台因 msg_seq 重复而去重的错误码，重试时出现说明前一次请求很可能已成功"""
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+"""重复执行结果不变的 HTTP 方法"""
+
+
+@dataclass
+class RetryStats:
+    """重试指标"""
+
+    retries: int = 0
+    """已安排的重试次数"""
+    recovered: int = 0
+    """经重试后成功的请求数"""
+    exhausted: int = 0
+    """重试次数或时间预算耗尽后仍失败的请求数"""
+    deduplicated: int = 0
+    """重试被平台按 msg_seq 去重 (前一次请求已送达) 的请求数"""
+
+
+class RetryPolicy:
+    """按路由分类的重试策略"""
+
+    def __init__(self, config: Optional[RetryConfig] = None):
+        self.config = config or RetryConfig()
+        self.stats = RetryStats()
+
+    def max_attempts(self, route: Optional[str]) -> int:
+        override = self.config.routes.get(route) if route is not None else None
+        if override is not None and override.max_attempts is not None:
+            return override.max_attempts
+        return self.config.max_attempts
+
+    def retryable(self, route: Optional[str], status: int, code: int) -> bool:
+        """该路由上的错误响应是否可重试"""
+        override = self.config.routes.get(route) if route is not None else None
+        statuses = self.config.statuses
+        codes = self.config.codes
+        if override is not None:
+            if override.statuses is not None:
+                statuses = override.statuses
+            codes = codes | override.codes
+        return status in statuses or code in codes
+
+    def replayable(self, route: Optional[str], method: str, body: Any = None) -> bool:
+        """可能已被平台受理的请求能否原样重发
+
+        幂等方法与带 ``msg_seq`` 的消息体 (重复时由平台去重) 可以重发；
+        其余请求重发可能产生重复消息，除非路由以 ``RouteRetry.replay`` 显式放开。
+        """
+        override = self.config.routes.get(route) if route is not None else None
+        if override is not None and override.replay is not None:
+            return override.replay
+        return method.upper() in IDEMPOTENT_METHODS or (
+            isinstance(body, dict) and "msg_seq" in body
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次重试 (从 1 开始) 的退避秒数"""
+        cap = min(self.config.max_delay, self.config.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+    def schedule(
+        self,
+        route: Optional[str],
+        attempt: int,
+        deadline: float,
+        retry_after: Optional[float] = None,
+    ) -> Optional[float]:
+        """为已失败 attempt 次的请求安排下一次重试
+
+        Args:
+            retry_after: 响应的 Retry-After 秒数，退避不会短于该值
+
+        Returns:
+            需要等待的秒数；次数或时间预算耗尽时返回 None
+        """
+        if attempt >= self.max_attempts(route):
+            self.stats.exhausted += 1
+            return None
+        delay = self.backoff(attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if time.monotonic() + delay > deadline:
+            self.stats.exhausted += 1
+            return None
+        self.stats.retries += 1
+        return delay
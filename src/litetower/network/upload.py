@@ -0,0 +1,172 @@
+"""媒体上传请求体与暂存。
+
+``file_data`` 上传需要把整个文件 base64 后放入 JSON，一次性构建会同时持有
+原始内容、base64 字符串与 JSON 序列化结果三份拷贝。``Base64JsonBody`` 改为
+按块编码并流式写出，峰值内存只与块大小相关。
+
+``MediaStager`` 则完全绕开 ``file_data``：媒体以内容哈希命名写入文件服务器目录，
+上传时只提交 URL，由平台自行拉取。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from litetower.logging import logger
+
+from litetower.config.server import FileServerConfig
+from litetower.message.element import MediaElement
+
+CHUNK_SIZE = 3 * (1 << 16)
+"""每块原始字节数，为 3 的倍数以保证块间 base64 无需填充"""
+
+STREAM_THRESHOLD = 1 << 20
+"""内存中的媒体超过该大小时改用流式请求体"""
+
+
+class Base64JsonBody:
+    """``{...fields, "<field>": "<base64>"}`` 形式的流式 JSON 请求体。
+
+    可重复迭代，重试时会重新从媒体源读取。
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Any],
+        field: str,
+        media: MediaElement,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        if chunk_size % 3:
+            raise ValueError("chunk_size 必须是 3 的倍数")
+        head = json.dumps(fields, ensure_ascii=False)[:-1]
+        if fields:
+            head += ", "
+        self._head = f'{head}"{field}": "'.encode()
+        self._tail = b'"}'
+        self._media = media
+        self._chunk_size = chunk_size
+        self._size = media.size
+
+    def __len__(self) -> int:
+        return len(self._head) + 4 * ((self._size + 2) // 3) + len(self._tail)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Content-Length": str(len(self))}
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._head
+        # 读取与编码在线程池中进行，不阻塞事件循环
+        with contextlib.closing(self._media.iter_chunks(self._chunk_size)) as chunks:
+            while (encoded := await asyncio.to_thread(_next_encoded, chunks)) is not None:
+                yield encoded
+        yield self._tail
+
+
+def _next_encoded(chunks: Iterator[bytes]) -> Optional[bytes]:
+    chunk = next(chunks, None)
+    return None if chunk is None else base64.b64encode(chunk)
+
+
+def should_stream(media: MediaElement) -> bool:
+    """媒体是否应使用流式请求体上传"""
+    return media.lazy or len(media.inline_data) > STREAM_THRESHOLD
+
+
+_MAGIC = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF8", ".gif"),
+    (b"#!SILK", ".silk"),
+    (b"\x02#!SILK", ".silk"),
+    (b"#!AMR", ".amr"),
+)
+
+
+def _guess_suffix(head: bytes) -> str:
+    for magic, suffix in _MAGIC:
+        if head.startswith(magic):
+            return suffix
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:8] == b"ftyp":
+        return ".mp4"
+    return ""
+
+
+class MediaStager:
+    """将媒体暂存到文件服务器目录，返回平台可拉取的公开 URL"""
+
+    def __init__(self, config: FileServerConfig):
+        if not config.public_url:
+            raise ValueError("启用 stage_media 时必须配置 FileServerConfig.public_url")
+        self.config = config
+        self.directory = Path(config.localpath) / config.stage_dir
+        self.base_url = (
+            f"{config.public_url.rstrip('/')}/{config.remote_url.strip('/')}/{config.stage_dir}"
+        )
+        self._gc_at = 0.0
+
+    async def stage(self, media: MediaElement) -> str:
+        """暂存媒体并返回其 URL；相同内容只写入一次"""
+        path = await asyncio.to_thread(self._write, media)
+        if time.monotonic() - self._gc_at >= self.config.gc_interval:
+            self._gc_at = time.monotonic()
+            await asyncio.to_thread(self.gc)
+        return f"{self.base_url}/{path.name}"
+
+    def _write(self, media: MediaElement) -> Path:
+        suffix = _guess_suffix(media.head(16))
+        path = self.directory / f"{media.sha256()}{suffix}"
+        if path.exists():
+            # 刷新 mtime，避免仍在使用的文件被清理
+            os.utime(path)
+            return path
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # 总是复制而不是硬链接：源文件之后被原地修改时，内容寻址的文件名不会随之变化。
+        # 临时文件名唯一，同一内容并发暂存时各自写入，后完成的替换结果相同
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=self.directory)
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in media.iter_chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+            # 以实际写入的内容命名，源文件在计算哈希后被修改时也不会以旧哈希提供新内容
+            path = path.with_name(f"{digest.hexdigest()}{suffix}")
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        return path
+
+    def gc(self) -> int:
+        """删除超过 stage_ttl 未使用的暂存文件，返回删除数量
+
+        以 mtime 判断：写入与复用时都会刷新 mtime。
+        """
+        if not self.directory.is_dir():
+            return 0
+        deadline = time.time() - self.config.stage_ttl
+        removed = 0
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < deadline:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.debug(f"已清理 {removed} 个过期暂存媒体")
+        return removed
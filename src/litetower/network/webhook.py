@@ -6,15 +6,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any, Callable, Dict, Optional, Type
 
 import arclet.letoderea as leto
-from litetower.logging import logger
+from litetower.logging import (
+    EventFlowRecord,
+    event_flow_verbosity,
+    log_event_flow_record,
+    logger,
+)
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 
+from litetower.beacon.builtins.letoderea import SubscriberIndex
 from litetower.config.debug import DebugConfig
+from litetower.events.attachments import on_dispatch
 from litetower.events.message import (
     C2CMessage,
     ChannelMessage,
@@ -40,6 +48,9 @@ from litetower.models.elements.guild import GuildMember
 from litetower.models.elements.normal import Group, Member
 from litetower.models.scene import MessageScene
 from litetower.models.webhook import EventData, Payload
+from litetower.network.decoder import JsonLoads, fast_factory
+from litetower.network.dedup import Deduplicator, payload_key
+from litetower.network.ingress import WebhookIngress
 
 
 # ===== 事件工厂函数 =====
@@ -164,17 +175,155 @@ EVENT_MAP: Dict[str, tuple[str, Callable[[EventData, str], Any]]] = {
 }
 
 
+# ===== 事件流日志 =====
+# 按事件类取出日志字段，仅在 event_flow_verbosity 放行时调用；
+# full 为 False 时不携带消息内容。
+
+def _flow_group_message(label: str, e: GroupMessage, full: bool) -> EventFlowRecord:
+    return EventFlowRecord(
+        label, "群", e.group.group_openid,
+        e.author.username or e.author.id, e.content if full else None,
+    )
+
+
+def _flow_c2c_message(label: str, e: C2CMessage, full: bool) -> EventFlowRecord:
+    return EventFlowRecord(
+        label, "用户", e.author.id or e.author.user_openid or "",
+        e.author.username or e.author.id, e.content if full else None,
+    )
+
+
+def _flow_channel_message(label: str, e: ChannelMessage, full: bool) -> EventFlowRecord:
+    return EventFlowRecord(
+        label, "频道", e.guild_id,
+        e.author.username or e.author.id, e.content if full else None,
+    )
+
+
+def _flow_direct_message(label: str, e: DirectMessage, full: bool) -> EventFlowRecord:
+    return EventFlowRecord(
+        label, "频道", e.guild_id,
+        e.author.username or e.author.id, e.content if full else None,
+        note="收到私信",
+    )
+
+
+def _flow_group_event(note: str) -> Callable[[str, Any, bool], EventFlowRecord]:
+    def extract(label: str, e: Any, full: bool) -> EventFlowRecord:
+        return EventFlowRecord(label, "群", e.group_openid, note=note)
+    return extract
+
+
+def _flow_robot_event(action: str) -> Callable[[str, Any, bool], EventFlowRecord]:
+    def extract(label: str, e: Any, full: bool) -> EventFlowRecord:
+        return EventFlowRecord(
+            label, "群", e.group_openid, note=f"操作者:{e.op_member_openid or '?'} {action}"
+        )
+    return extract
+
+
+def _flow_user_event(note: str) -> Callable[[str, Any, bool], EventFlowRecord]:
+    def extract(label: str, e: Any, full: bool) -> EventFlowRecord:
+        return EventFlowRecord(label, "用户", e.user_openid, note=note)
+    return extract
+
+
+EVENT_FLOW: Dict[type, Callable[[str, Any, bool], EventFlowRecord]] = {
+    GroupMessage:   _flow_group_message,
+    C2CMessage:     _flow_c2c_message,
+    ChannelMessage: _flow_channel_message,
+    DirectMessage:  _flow_direct_message,
+    GroupAllowBotProactiveMessage:  _flow_group_event("开启主动消息"),
+    GroupRejectBotProactiveMessage: _flow_group_event("关闭主动消息"),
+    C2CAllowBotProactiveMessage:    _flow_user_event("开启主动消息"),
+    C2CRejectBotProactiveMessage:   _flow_user_event("关闭主动消息"),
+    FriendAdd:      _flow_user_event("成为好友"),
+    FriendDel:      _flow_user_event("删除好友"),
+    GroupAddRobot:  _flow_robot_event("入群"),
+    GroupDelRobot:  _flow_robot_event("移群"),
+}
+"""事件类 -> 事件流日志提取函数；子类 (如紧凑事件) 按 MRO 解析到基类的条目"""
+
+
+def event_flow_extractor(cls: type) -> Optional[Callable[[str, Any, bool], EventFlowRecord]]:
+    """按 ``cls.__mro__`` 查找事件流提取函数，结果缓存回 ``EVENT_FLOW``"""
+    extract = EVENT_FLOW.get(cls)
+    if extract is None:
+        extract = next((EVENT_FLOW[base] for base in cls.__mro__ if base in EVENT_FLOW), None)
+        if extract is not None:
+            EVENT_FLOW[cls] = extract
+    return extract
+
+
+EVENT_TYPES: Dict[str, type] = {
+    "GROUP_AT_MESSAGE_CREATE": GroupMessage,
+    "C2C_MESSAGE_CREATE":     C2CMessage,
+    "AT_MESSAGE_CREATE":      ChannelMessage,
+    "DIRECT_MESSAGE_CREATE":  DirectMessage,
+    "GROUP_MSG_RECEIVE": GroupAllowBotProactiveMessage,
+    "GROUP_MSG_REJECT":  GroupRejectBotProactiveMessage,
+    "C2C_MSG_RECEIVE":   C2CAllowBotProactiveMessage,
+    "C2C_MSG_REJECT":    C2CRejectBotProactiveMessage,
+    "FRIEND_ADD":       FriendAdd,
+    "FRIEND_DEL":       FriendDel,
+    "GROUP_ADD_ROBOT":  GroupAddRobot,
+    "GROUP_DEL_ROBOT":  GroupDelRobot,
+}
+"""事件类型 -> 事件类，用于订阅者存在性检查"""
+
+
 # ===== Webhook 请求处理 =====
 
+def dispatch_payload(data: Dict[str, Any]) -> Optional[asyncio.Task[None]]:
+    """校验 OP 0 负载，构建事件并通过 Letoderea 发布。
+
+    Returns:
+        Letoderea 分发任务；未知事件类型时为 None。
+    """
+    event_type = data.get("t") or ""
+    entry = EVENT_MAP.get(event_type)
+    if not entry:
+        return None
+
+    label, factory = entry
+    fast = fast_factory(event_type)
+    if fast is not None:
+        # 消息事件: 直接从原始 dict 构建，跳过 EventData
+        event = fast(data.get("d") or {}, data.get("id") or "")
+    else:
+        payload = Payload.model_validate(data)
+        event = factory(payload.d, payload.id)
+
+    verbosity = event_flow_verbosity(event_type)
+    extract = event_flow_extractor(type(event)) if verbosity else None
+    if extract is not None:
+        log_event_flow_record(extract(label, event, verbosity > 1))
+
+    if fast is not None:
+        on_dispatch(event)
+    return leto.publish(event)
+
+
 async def postevent(
     request: Request,
     debug_config: Optional[DebugConfig],
     bot_secret: str,
+    ingress: Optional[WebhookIngress] = None,
+    dedup: Optional[Deduplicator] = None,
+    loads: JsonLoads = json.loads,
+    index: Optional[SubscriberIndex] = None,
 ) -> Response:
-    """处理 webhook 事件请求"""
+    """处理 webhook 事件请求
+
+    请求体由 ``loads`` 指定的 JSON 后端直接从字节解析。
+    传入 ``index`` 时，没有订阅者的事件类型直接 ACK，不构建、不记录日志、不发布。
+    传入 ``dedup`` 时，TTL 内重复投递的 OP 0 负载直接 ACK 而不再分发。
+    传入 ``ingress`` 时，OP 0 负载在解码后立即入队并 ACK，
+    由入站队列的 worker 池异步完成分发。
+    """
     try:
-        data = await request.json()
-    except json.JSONDecodeError:
+        data = loads(await request.body())
+    except ValueError:
         logger.warning("无效的 JSON 数据")
         return JSONResponse({"error": "invalid json"}, status_code=400)
 
@@ -185,63 +334,39 @@ async def postevent(
 
     # OP 0: 事件分发
     if op == 0:
+        if index is not None:
+            event_cls = EVENT_TYPES.get(data.get("t") or "")
+            if event_cls is not None and event_cls not in index:
+                return JSONResponse({"status": "ok"})
+
+        # 先判断能否接收，避免被 503 拒绝的事件记入去重表后平台重投也被忽略
+        if ingress is not None and not ingress.admit():
+            logger.warning(f"入站队列已满，拒绝事件 [{data.get('t')}]")
+            return JSONResponse({"error": "busy"}, status_code=503)
+
+        key = payload_key(data) if dedup is not None else ""
+        if dedup is not None and dedup.check(key):
+            logger.debug(f"忽略重复投递的事件 [{data.get('t')}] {key}")
+            return JSONResponse({"status": "ok"})
+
+        if ingress is not None:
+            # 入队前记录：入队可能等待，期间到达的重投不应再次入队。
+            # admit() 之后没有让出事件循环，reject 策略下 put 不会失败
+            if dedup is not None:
+                dedup.record(key)
+            if not await ingress.put(data):
+                logger.warning(f"入站队列已满，拒绝事件 [{data.get('t')}]")
+                return JSONResponse({"error": "busy"}, status_code=503)
+            return JSONResponse({"status": "ok"})
+
         try:
-            payload = Payload.model_validate(data)
-            event_type = payload.t
-            entry = EVENT_MAP.get(event_type)
-            if entry:
-                label, factory = entry
-                event = factory(payload.d, payload.id)
-                
-                # 详细事件流日志
-                from litetower.logging import log_event_flow
-                
-                source = "Unknown"
-                detail = "Dispatching"
-                
-                # 尝试解析事件详情
-                if hasattr(event, "group") and event.group:
-                    source = f"群:{event.group.group_openid}"
-                elif hasattr(event, "guild_id") and event.guild_id:
-                    source = f"频道:{event.guild_id}"
-                elif hasattr(event, "author") and event.author:
-                    source = f"用户:{event.author.id}"
-                elif hasattr(event, "group_openid") and event.group_openid:
-                     source = f"群:{event.group_openid}"
-                elif hasattr(event, "user_openid") and event.user_openid:
-                     source = f"用户:{event.user_openid}"
-                elif hasattr(event, "openid") and event.openid:
-                     source = f"用户:{event.openid}"
-                
-                # Detail
-                if hasattr(event, "content") and hasattr(event, "content") and event.content:
-                     # 消息内容
-                     user_name = "?"
-                     if hasattr(event, "member") and event.member and hasattr(event.member, "name"):
-                         user_name = event.member.name
-                     elif hasattr(event, "author") and event.author:
-                         user_name = event.author.username or event.author.id
-                     
-                     detail = f"{user_name} 说: {event.content}"
-                elif event_type == "GROUP_ADD_ROBOT":
-                     detail = f"操作者:{getattr(event, 'op_member_openid', '?')} 入群"
-                elif event_type == "GROUP_DEL_ROBOT":
-                     detail = f"操作者:{getattr(event, 'op_member_openid', '?')} 移群"
-                elif event_type == "FRIEND_ADD":
-                     detail = "成为好友"
-                elif event_type == "FRIEND_DEL":
-                     detail = "删除好友"
-                elif "MSG_RECEIVE" in event_type:
-                     detail = "开启主动消息"
-                elif "MSG_REJECT" in event_type:
-                     detail = "关闭主动消息"
-                elif "DIRECT_MESSAGE" in event_type:
-                     detail = "收到私信"
-
-                log_event_flow(label, source, detail)
-                leto.publish(event)
+            dispatch_payload(data)
         except Exception as e:
             logger.exception(f"事件处理失败: {e}")
+        else:
+            # 只记录成功分发的负载，失败时平台的重投仍会被处理
+            if dedup is not None:
+                dedup.record(key)
 
         return JSONResponse({"status": "ok"})
 
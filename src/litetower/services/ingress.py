@@ -0,0 +1,42 @@
+"""Webhook 入站队列服务 (Launart)"""
+
+from __future__ import annotations
+
+from launart import Service, Launart
+from litetower.logging import logger
+
+from litetower.network.ingress import WebhookIngress
+
+
+class IngressService(Service):
+    """入站队列 worker 池，通过 Launart 管理生命周期。"""
+
+    id = "litetower.services/ingress"
+    supported_interface_types = set()
+
+    def __init__(self, ingress: WebhookIngress):
+        self.ingress = ingress
+        super().__init__()
+
+    @property
+    def required(self) -> set[str]:
+        return set()
+
+    @property
+    def stages(self) -> set[str]:
+        return {"preparing", "blocking", "cleanup"}
+
+    async def launch(self, manager: Launart) -> None:
+        async with self.stage("preparing"):
+            self.ingress.start()
+
+        async with self.stage("blocking"):
+            await manager.status.wait_for_sigexit()
+
+        async with self.stage("cleanup"):
+            await self.ingress.stop()
+            stats = self.ingress.stats
+            logger.info(
+                f"入站队列统计: processed={stats.processed}, failed={stats.failed}, "
+                f"dropped={stats.dropped}, rejected={stats.rejected}, max_depth={stats.max_depth}"
+            )
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+from typing import Any, Optional
 
 import uvicorn
 from launart import Service, Launart
@@ -17,7 +17,15 @@ class UvicornService(Service):
     id = "litetower.services/uvicorn"
     supported_interface_types = set()
 
-    def __init__(self, app: Starlette, host: str = "0.0.0.0", port: int = 2077):
+    def __init__(
+        self,
+        app: Starlette,
+        host: str = "0.0.0.0",
+        port: int = 2077,
+        id: Optional[str] = None,
+    ):
+        if id is not None:
+            self.id = id
         self.asgi_app = app
         self.host = host
         self.port = port
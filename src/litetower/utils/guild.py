@@ -2,6 +2,8 @@
 
 import json
 import re
+from dataclasses import dataclass
+from typing import ClassVar, Union
 
 
 def escape(s: str) -> str:
@@ -12,29 +14,111 @@ def unescape(s: str) -> str:
     return s.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
 
 
+@dataclass(frozen=True, slots=True)
+class TextSegment:
+    """文本片段 (已反转义)"""
+
+    text: str
+    type: ClassVar[str] = "text"
+
+    def to_dict(self) -> dict[str, str]:
+        return {"type": self.type, "text": self.text}
+
+
+@dataclass(frozen=True, slots=True)
+class MentionUser:
+    """@用户"""
+
+    user_id: str
+    type: ClassVar[str] = "mention_user"
+
+    def to_dict(self) -> dict[str, str]:
+        return {"type": self.type, "user_id": self.user_id}
+
+
+@dataclass(frozen=True, slots=True)
+class MentionChannel:
+    """#子频道"""
+
+    channel_id: str
+    type: ClassVar[str] = "mention_channel"
+
+    def to_dict(self) -> dict[str, str]:
+        return {"type": self.type, "channel_id": self.channel_id}
+
+
+@dataclass(frozen=True, slots=True)
+class EmojiSegment:
+    """表情"""
+
+    id: str
+    type: ClassVar[str] = "emoji"
+
+    def to_dict(self) -> dict[str, str]:
+        return {"type": self.type, "id": self.id}
+
+
+@dataclass(frozen=True, slots=True)
+class MentionEveryone:
+    """@全体成员"""
+
+    type: ClassVar[str] = "everyone"
+
+    def to_dict(self) -> dict[str, str]:
+        return {"type": self.type}
+
+
+Segment = Union[TextSegment, MentionUser, MentionChannel, EmojiSegment, MentionEveryone]
+"""频道消息片段"""
+
+_EVERYONE = MentionEveryone()
+
+# 兼容转义形式 (``\<...\>``)
+_SEGMENT = re.compile(
+    r"\\?<(?:"
+    r"(?P<kind>@|#|emoji:)!?(?P<id>\w+?)"
+    r"|qqbot-at-user id=\"(?P<user>\w+)\"\s*/"
+    r"|qqbot-at-everyone\s*/"
+    r")\\?>"
+    r"|@everyone"
+)
+
+
+def parse_segments(msg: str) -> list[Segment]:
+    """单次扫描将频道消息切分为文本、@用户、#子频道、表情与 @全体成员 片段"""
+    result: list[Segment] = []
+    text_begin = 0
+    for embed in _SEGMENT.finditer(msg):
+        start = embed.start()
+        if start > text_begin:
+            result.append(TextSegment(unescape(msg[text_begin:start])))
+        text_begin = embed.end()
+        kind = embed["kind"]
+        if kind == "@":
+            result.append(MentionUser(embed["id"]))
+        elif kind == "#":
+            result.append(MentionChannel(embed["id"]))
+        elif kind == "emoji:":
+            result.append(EmojiSegment(embed["id"]))
+        elif embed["user"] is not None:
+            result.append(MentionUser(embed["user"]))
+        else:
+            result.append(_EVERYONE)
+    if text_begin < len(msg):
+        result.append(TextSegment(unescape(msg[text_begin:])))
+    return result
+
+
 def handle_text(msg: str) -> dict[str, str]:
-    """解析频道消息中的 @ 和 emoji 等特殊元素"""
+    """解析频道消息中的 @ 和 emoji 等特殊元素 (@全体成员 被移除)"""
     result: list[dict[str, str]] = []
-    text_begin = 0
-    msg = msg.replace("@everyone", "")
-    msg = re.sub(r"\\<qqbot-at-everyone\s/\\>", "", msg)
-    for embed in re.finditer(
-        r"\\<(?P<type>(?:@|#|emoji:))!?(?P<id>\w+?)\\>|\\<(?P<type1>qqbot-at-user) id=\"(?P<id1>\w+)\"\s/\\>",
-        msg,
-    ):
-        if content := msg[text_begin : embed.pos + embed.start()]:
-            result.append({"type": "text", "text": unescape(content)})
-        text_begin = embed.pos + embed.end()
-        if embed["type"] == "@":
-            result.append({"type": "mention_user", "user_id": embed.group("id")})
-        elif embed["type"] == "#":
-            result.append({"type": "mention_channel", "channel_id": embed.group("id")})
-        elif embed["type"] == "emoji":
-            result.append({"type": "emoji", "id": embed.group("id")})
-        elif embed["type1"] == "qqbot-at-user":
-            result.append({"type": "mention_user", "user_id": embed.group("id1")})
-    if content := msg[text_begin:]:
-        result.append({"type": "text", "text": unescape(content)})
+    for segment in parse_segments(msg):
+        if isinstance(segment, MentionEveryone):
+            continue
+        if isinstance(segment, TextSegment) and result and result[-1]["type"] == "text":
+            result[-1]["text"] += segment.text
+            continue
+        result.append(segment.to_dict())
     return {"messages": json.dumps(result)}
 
 